@@ -1,8 +1,9 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
-import os
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache
 from dotenv import load_dotenv
 
+# Load .env once for the whole process; services that read os.environ
+# directly (OpenAI/Gemini keys) rely on this having run.
 load_dotenv()
 
 class Settings(BaseSettings):
@@ -10,31 +11,36 @@ class Settings(BaseSettings):
     APP_NAME: str = "TaxWise"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
-    
+
     # Supabase Configuration
-    SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
-    SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
-    SUPABASE_SERVICE_KEY: str = os.getenv("SUPABASE_SERVICE_KEY", "")
-    SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
-    
+    SUPABASE_URL: str = ""
+    SUPABASE_KEY: str = ""
+    SUPABASE_SERVICE_KEY: str = ""
+    SUPABASE_JWT_SECRET: str = ""
+
     # OpenAI Configuration
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    
+    OPENAI_API_KEY: str = ""
+
+    # Gemini Configuration
+    GOOGLE_API_KEY: str = ""
+
     # JWT Configuration
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
+    SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
-    
+
     # File Upload Configuration
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
-    ALLOWED_EXTENSIONS: set = {".csv", ".pdf", ".xlsx", ".xls"}
-    
+    ALLOWED_EXTENSIONS: frozenset = frozenset({".csv", ".pdf", ".xlsx", ".xls"})
+
     # Tax Configuration (Indian Tax System)
     TAX_YEAR: int = 2024
     STANDARD_DEDUCTION: int = 50000
-    
-    model_config = {
-        "extra": "allow"
-    }
 
-settings = Settings()
\ No newline at end of file
+    # Env is read once at construction; the snapshot is immutable afterwards
+    model_config = SettingsConfigDict(env_file=".env", frozen=True, extra="ignore")
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings singleton (override via app.dependency_overrides in tests)"""
+    return Settings()
@@ -0,0 +1,8 @@
+import os
+import uuid
+from typing import List
+
+def new_ids(count: int) -> List[str]:
+    """count UUID4 strings (same format as str(uuid.uuid4())) drawn from a single urandom read"""
+    raw = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, len(raw), 16)]
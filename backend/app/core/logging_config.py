@@ -0,0 +1,35 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Single stdout handler for the whole process; modules log via logging.getLogger(__name__).
+# Records are formatted by the caller and written by a listener thread, so request
+# handlers never block on stdout.
+_log_queue = queue.SimpleQueue()
+_log_listener: Optional[QueueListener] = None
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Route the root logger through the shared queue (records wait there until the listener starts)"""
+    logging.basicConfig(
+        level=level,
+        format=LOG_FORMAT,
+        handlers=[QueueHandler(_log_queue)],
+        force=True
+    )
+
+def start_log_listener() -> None:
+    """Start the thread that drains the log queue to stdout; safe to call more than once"""
+    global _log_listener
+    if _log_listener is None:
+        _log_listener = QueueListener(_log_queue, logging.StreamHandler())
+        _log_listener.start()
+
+def stop_log_listener() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
@@ -0,0 +1,23 @@
+from datetime import date
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _default(obj: Any) -> Any:
+    # pandas.Timestamp is a datetime subclass orjson won't serialize natively
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also accepts the numpy/pandas values our parsers produce"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
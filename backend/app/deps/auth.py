@@ -1,19 +1,118 @@
+import asyncio
+import base64
+import hashlib
+import time
+from typing import Any, Dict, NamedTuple, Optional, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
-from app.config import SUPABASE_JWT_SECRET
+import orjson
+from app.core.config import get_settings
 
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+class CurrentUser(NamedTuple):
+    """Authenticated caller resolved from the bearer token"""
+    id: str
+    email: Optional[str] = None
+
+# 401 response arguments; each rejection raises a fresh HTTPException built from these so
+# no exception state (traceback, __context__) is shared between requests
+_TOKEN_EXPIRED = {"status_code": status.HTTP_401_UNAUTHORIZED, "detail": "Token expired"}
+_INVALID_TOKEN = {"status_code": status.HTTP_401_UNAUTHORIZED, "detail": "Invalid token"}
+_MISSING_USER_ID = {"status_code": status.HTTP_401_UNAUTHORIZED, "detail": "Invalid token: missing user ID"}
+
+# Resolved users keyed by SHA-256(token) -> (CurrentUser, cache_expiry)
+TOKEN_CACHE_MAX_SIZE = 10000
+TOKEN_CACHE_TTL_SECONDS = 300
+_token_cache = {}
+
+# In-progress verifications keyed like _token_cache -> asyncio.Future[CurrentUser]
+_inflight_verifications = {}
+
+def _cache_key(token: str) -> str:
+    # Hash the token so raw bearer credentials are never held as dict keys
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _get_cached_user(key: str) -> Optional[CurrentUser]:
+    entry = _token_cache.get(key)
+    if entry is None:
+        return None
+    user, expires_at = entry
+    if expires_at <= time.time():
+        _token_cache.pop(key, None)
+        return None
+    return user
+
+def _cache_user(key: str, user: CurrentUser, exp) -> None:
+    now = time.time()
+    # Never cache past the token's own lifetime
+    expires_at = min(exp, now + TOKEN_CACHE_TTL_SECONDS) if exp else now + TOKEN_CACHE_TTL_SECONDS
+    if expires_at <= now:
+        return
+    if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+        # Drop expired entries first, then the oldest insertions
+        for stale_key in [k for k, (_, e) in _token_cache.items() if e <= now]:
+            del _token_cache[stale_key]
+        while len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            del _token_cache[next(iter(_token_cache))]
+    _token_cache[key] = (user, expires_at)
+
+def _unverified_exp(token: str):
+    """Read the exp claim without checking the signature (fast negative filter only)"""
+    try:
+        payload_segment = token.split(".")[1]
+        payload = orjson.loads(base64.urlsafe_b64decode(payload_segment + "=" * (-len(payload_segment) % 4)))
+        return payload.get("exp") if isinstance(payload, dict) else None
+    except (IndexError, ValueError):  # orjson.JSONDecodeError is a ValueError
+        return None
+
+def warm_up_token_verifier() -> None:
+    """Exercise the HS256 verify path once so its lazy setup isn't paid by the first request"""
+    secret = get_settings().SUPABASE_JWT_SECRET
+    if not secret:
+        return
+    probe = jwt.encode({"sub": "warmup", "exp": int(time.time()) + 60}, secret, algorithm="HS256")
+    jwt.decode(probe, secret, algorithms=["HS256"])
+
+async def _verify_token(key: str, token: str) -> Union[CurrentUser, Dict[str, Any]]:
+    """The verified user, or the 401 arguments to reject with (returned, not raised, since
+    concurrent waiters share this result)"""
     try:
-        payload = jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token: missing user ID")
-        return {"id": user_id}
+        # Signature verification runs off the event loop; cache hits never get here
+        payload = await asyncio.to_thread(
+            jwt.decode, token, get_settings().SUPABASE_JWT_SECRET, algorithms=["HS256"]
+        )
     except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
+        return _TOKEN_EXPIRED
     except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+        return _INVALID_TOKEN
+    user_id = payload.get("sub")
+    if not user_id:
+        return _MISSING_USER_ID
+    user = CurrentUser(id=user_id, email=payload.get("email"))
+    _cache_user(key, user, payload.get("exp"))
+    return user
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> CurrentUser:
+    token = credentials.credentials
+    key = _cache_key(token)
+    user = _get_cached_user(key)
+    if user is not None:
+        return user
+    # A forged "expired" token is rejected either way; unexpired ones still get a full verify
+    exp = _unverified_exp(token)
+    if isinstance(exp, (int, float)) and exp < time.time():
+        raise HTTPException(**_TOKEN_EXPIRED)
+    # Single-flight: concurrent requests with the same uncached token share one verification
+    verification = _inflight_verifications.get(key)
+    if verification is None:
+        verification = asyncio.ensure_future(_verify_token(key, token))
+        _inflight_verifications[key] = verification
+        verification.add_done_callback(lambda _: _inflight_verifications.pop(key, None))
+    # shield() so one cancelled request doesn't cancel the verification others are awaiting
+    result = await asyncio.shield(verification)
+    if isinstance(result, dict):
+        # A fresh 401 per request; the shared task's result is never raised itself
+        raise HTTPException(**result)
+    return result
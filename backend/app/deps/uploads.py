@@ -0,0 +1,21 @@
+import io
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile, status
+from app.core.config import get_settings
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Maximum size is {max_size // (1024 * 1024)}MB"
+    )
+
+def upload_stream(upload: UploadFile) -> BinaryIO:
+    """Rewound handle to the upload Starlette already spooled (to disk past 1 MB); no bytes copy"""
+    max_size = get_settings().MAX_UPLOAD_SIZE
+    # size is unset when the upload didn't come through the multipart parser; measure the spool
+    size = upload.size if upload.size is not None else upload.file.seek(0, io.SEEK_END)
+    if size > max_size:
+        raise _too_large(max_size)
+    upload.file.seek(0)
+    return upload.file
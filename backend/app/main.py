@@ -1,12 +1,15 @@
-from fastapi import FastAPI, APIRouter, UploadFile, File, Form, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, UploadFile, File, Form, HTTPException, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Optional
+import asyncio
+import logging
+import time
 import uuid
+from collections import defaultdict
 from datetime import datetime
 import os
-from dotenv import load_dotenv
-from app.core.config import settings
+from app.core.config import get_settings
 from app.models.debt import Debt
 from app.models.database import (
     User, UserCreate, UserLogin, Transaction, TaxData, 
@@ -16,18 +19,27 @@ from app.services.debt_service import DebtService
 from app.services.tax_calculator import TaxCalculator
 from app.services.cibil_advisor import CIBILAdvisor
 from app.services.file_parser import FileParser
-from app.deps.auth import get_current_user
+from app.deps.auth import CurrentUser, get_current_user, warm_up_token_verifier
+from app.deps.uploads import upload_stream
+from app.core.responses import FastJSONResponse
+from app.core.ids import new_ids
+from app.services.ai_document_processor import shutdown_pdf_pool
+from app.core.logging_config import configure_logging, start_log_listener, stop_log_listener
 from app.services.capital_gains_service import CapitalGainsService
 
-# Load environment variables
-load_dotenv()
-SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+configure_logging()
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+# Dot-less, lowercased for a direct check against the parsed upload extension
+ALLOWED_UPLOAD_EXTENSIONS = frozenset(ext.lstrip('.').lower() for ext in settings.ALLOWED_EXTENSIONS)
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -39,7 +51,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize servicesfrom app.services.chatbot import ask_gemini
+from app.services.chatbot import ask_gemini, stream_gemini
+
+# Initialize services
 
 debt_service = DebtService()
 tax_calculator = TaxCalculator()
@@ -50,7 +64,19 @@ capital_gains_service = CapitalGainsService()
 # In-memory storage (replace with actual database in production)
 user_debts = {}
 users_db = {}
+users_by_email = {}  # lowercased email -> user_id index for register/login
 transactions_db = {}
+analysis_cache = {}  # user_id -> (transaction count, analyze_transactions result)
+data_versions = {}  # user_id -> counter bumped whenever dashboard inputs change
+cibil_score_cache = {}  # user_id -> calculate_score() result for the current CIBILData
+user_locks = defaultdict(asyncio.Lock)  # per-user guard for multi-step updates that await
+
+# Client-settable fields, resolved once instead of hasattr()/f-strings per request
+DEDUCTION_ATTRS = {
+    field[len("deduction_"):]: field for field in TaxData.model_fields if field.startswith("deduction_")
+}
+CIBIL_ATTRS = frozenset(CIBILData.model_fields)
+
 tax_data_db = {}
 cibil_data_db = {}
 user_gains = {}
@@ -70,7 +96,8 @@ async def ingest_debts(user_id: str = Form(...), file: UploadFile = File(...)):
 @debt_router.get('/debt/list')
 async def list_debts(user_id: str):
     debts = user_debts.get(user_id, [])
-    return {'debts': [vars(d) for d in debts]}
+    # Plain dicts go straight to orjson; skips jsonable_encoder's per-field walk
+    return FastJSONResponse({'debts': [d.to_dict() for d in debts]})
 
 @debt_router.post('/debt/simulate')
 async def simulate_debt(user_id: str = Form(...), strategy: str = Form('snowball')):
@@ -81,7 +108,7 @@ async def simulate_debt(user_id: str = Form(...), strategy: str = Form('snowball
 # Capital gains endpoints
 @capital_gains_router.post('/capital_gains/ingest')
 async def ingest_gains(user_id: str = Form(...), file: UploadFile = File(...)):
-    content = await file.read()
+    content = upload_stream(file)
     gains = capital_gains_service.ingest(user_id, content, file.filename)
     user_gains[user_id] = gains
     return {'success': True, 'count': len(gains)}
@@ -89,7 +116,7 @@ async def ingest_gains(user_id: str = Form(...), file: UploadFile = File(...)):
 @capital_gains_router.get('/capital_gains/list')
 async def list_gains(user_id: str):
     gains = user_gains.get(user_id, [])
-    return {'gains': [vars(g) for g in gains]}
+    return FastJSONResponse({'gains': [g.to_dict() for g in gains]})
 
 @capital_gains_router.post('/capital_gains/analyze')
 async def analyze_gains(user_id: str = Form(...)):
@@ -111,6 +138,7 @@ mock_user = User(
     created_at=datetime.now()
 )
 users_db[mock_user_id] = mock_user
+users_by_email[mock_user.email.lower()] = mock_user_id
 transactions_db[mock_user_id] = []
 tax_data_db[mock_user_id] = TaxData(
     id=str(uuid.uuid4()),
@@ -190,18 +218,31 @@ from typing import List, Dict, Optional
 import uuid
 from datetime import datetime
 import os
-from dotenv import load_dotenv
-# Load environment variables
-load_dotenv()
-SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=FastJSONResponse
 )
 
+@app.on_event("startup")
+async def warm_up_auth():
+    await asyncio.to_thread(warm_up_token_verifier)
+
+@app.on_event("startup")
+async def start_logging():
+    start_log_listener()
+
+@app.on_event("shutdown")
+async def stop_pdf_workers():
+    await asyncio.to_thread(shutdown_pdf_pool)
+
+@app.on_event("shutdown")
+async def stop_logging():
+    stop_log_listener()
+
 # Register debt router on the final app instance
 app.include_router(debt_router)
 
@@ -223,22 +264,27 @@ async def generate_tax_report_api(
     user_transactions = transactions_db.get(user_id, [])
 
     # Parse AIS/TIS transactions
-    ais_transactions = []
-    if ais_file:
+    async def parse_ais():
+        if not ais_file:
+            return []
         ext = ais_file.filename.split('.')[-1].lower()
         content = await ais_file.read()
         if ext == "json":
-            ais_transactions = file_parser.parse_ais_json(content, ais_file.filename)
+            return await asyncio.to_thread(file_parser.parse_ais_json, content, ais_file.filename)
         elif ext == "csv":
-            ais_transactions = file_parser.parse_ais_csv(content, ais_file.filename)
+            return await asyncio.to_thread(file_parser.parse_ais_csv, content, ais_file.filename)
         # Add PDF support if needed
+        return []
 
     # Parse broker capital gains transactions
-    capital_gains = []
-    if broker_file:
-        ext = broker_file.filename.split('.')[-1].lower()
+    async def parse_broker():
+        if not broker_file:
+            return []
         content = await broker_file.read()
-        capital_gains = file_parser.parse_broker_csv(content, broker_file.filename)
+        return await asyncio.to_thread(file_parser.parse_broker_csv, content, broker_file.filename)
+
+    # The two files are independent; parse them concurrently off the event loop
+    ais_transactions, capital_gains = await asyncio.gather(parse_ais(), parse_broker())
 
     # Generate tax report
     report = file_parser.generate_tax_report(
@@ -247,7 +293,7 @@ async def generate_tax_report_api(
         capital_gains=capital_gains,
         asset_type=asset_type
     )
-    return JSONResponse(content=report)
+    return report
 
 # Configure CORS
 app.add_middleware(
@@ -265,7 +311,19 @@ file_parser = FileParser()
 
 # In-memory storage (replace with actual database in production)
 users_db = {}
+users_by_email = {}  # lowercased email -> user_id index for register/login
 transactions_db = {}
+analysis_cache = {}  # user_id -> (transaction count, analyze_transactions result)
+data_versions = {}  # user_id -> counter bumped whenever dashboard inputs change
+cibil_score_cache = {}  # user_id -> calculate_score() result for the current CIBILData
+user_locks = defaultdict(asyncio.Lock)  # per-user guard for multi-step updates that await
+
+# Client-settable fields, resolved once instead of hasattr()/f-strings per request
+DEDUCTION_ATTRS = {
+    field[len("deduction_"):]: field for field in TaxData.model_fields if field.startswith("deduction_")
+}
+CIBIL_ATTRS = frozenset(CIBILData.model_fields)
+
 tax_data_db = {}
 cibil_data_db = {}
 
@@ -280,6 +338,7 @@ mock_user = User(
     created_at=datetime.now()
 )
 users_db[mock_user_id] = mock_user
+users_by_email[mock_user.email.lower()] = mock_user_id
 transactions_db[mock_user_id] = []
 tax_data_db[mock_user_id] = TaxData(
     id=str(uuid.uuid4()),
@@ -312,7 +371,7 @@ async def root():
 async def register(user_data: UserCreate):
     """Register a new user"""
     # Check if user already exists
-    if any(u.email == user_data.email for u in users_db.values()):
+    if user_data.email.lower() in users_by_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -330,6 +389,7 @@ async def register(user_data: UserCreate):
     )
     
     users_db[user_id] = user
+    users_by_email[user.email.lower()] = user_id
     transactions_db[user_id] = []
     
     # Initialize tax and CIBIL data
@@ -351,7 +411,8 @@ async def register(user_data: UserCreate):
 async def login(credentials: UserLogin):
     """Login user"""
     # Find user by email
-    user = next((u for u in users_db.values() if u.email == credentials.email), None)
+    user_id = users_by_email.get(credentials.email.lower())
+    user = users_db.get(user_id) if user_id else None
     
     if not user:
         raise HTTPException(
@@ -369,8 +430,7 @@ async def login(credentials: UserLogin):
 @app.post("/upload/{user_id}")
 async def upload_file(user_id: str, file: UploadFile = File(...)):
     """Upload and process financial statement file"""
-    print(f"Upload request for user_id: {user_id}")
-    print(f"Available users: {list(users_db.keys())}")
+    logger.debug("Upload request for user_id: %s (%d known users)", user_id, len(users_db))
     
     if user_id not in users_db:
         raise HTTPException(
@@ -379,47 +439,52 @@ async def upload_file(user_id: str, file: UploadFile = File(...)):
         )
     
     # Validate file extension
-    file_ext = file.filename.split('.')[-1].lower()
-    if f".{file_ext}" not in settings.ALLOWED_EXTENSIONS:
+    file_ext = os.path.splitext(file.filename)[1][1:].lower()
+    if file_ext not in ALLOWED_UPLOAD_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
+            detail=f"File type not allowed. Allowed types: {', '.join(sorted(settings.ALLOWED_EXTENSIONS))}"
         )
     
-    # Read file content
-    content = await file.read()
+    # Parsers read the spooled upload directly rather than a full in-memory copy
+    content = upload_stream(file)
     
     # Parse file based on type
     try:
-        print(f"Processing file: {file.filename}, type: {file_ext}")
+        logger.debug("Processing file: %s, type: %s", file.filename, file_ext)
         
-        if file_ext == 'csv':
-            transactions = file_parser.parse_csv(content, file.filename)
-        elif file_ext == 'pdf':
-            transactions = file_parser.parse_pdf(content, file.filename)
+        # Parsing and analysis run in worker threads so other requests keep being served
+        if file_ext == 'pdf':
+            transactions = await asyncio.to_thread(file_parser.parse_pdf, content, file.filename)
         else:
-            transactions = file_parser.parse_csv(content, file.filename)  # Try CSV for Excel files
-        
-        print(f"Parsed {len(transactions)} transactions")
-        
-        # Store transactions
-        if user_id not in transactions_db:
-            transactions_db[user_id] = []
-        
-        for transaction in transactions:
-            transaction.user_id = user_id
-            transaction.id = str(uuid.uuid4())
-            transactions_db[user_id].append(transaction)
-        
-        print(f"Stored transactions for user {user_id}, total: {len(transactions_db[user_id])}")
+            # Excel files are tried as CSV too
+            transactions = await asyncio.to_thread(file_parser.parse_csv, content, file.filename)
         
-        # Analyze transactions
-        analysis = file_parser.analyze_transactions(transactions)
-        print(f"Analysis complete: {len(analysis)} keys")
+        logger.debug("Parsed %d transactions", len(transactions))
         
-        # Update tax data with income information
-        if user_id in tax_data_db and 'income_analysis' in analysis:
-            tax_data_db[user_id].gross_income = analysis['income_analysis']['total'] * 12  # Annualized
+        # Serialise concurrent uploads for the same user; other users aren't blocked
+        async with user_locks[user_id]:
+            # Store transactions
+            for transaction, transaction_id in zip(transactions, new_ids(len(transactions))):
+                transaction.user_id = user_id
+                transaction.id = transaction_id
+            # register() creates the list alongside the user, and user_id was checked above
+            transactions_db[user_id].extend(transactions)
+            analysis_cache.pop(user_id, None)
+            bump_data_version(user_id)
+            
+            logger.debug("Stored transactions for user %s, total: %d", user_id, len(transactions_db[user_id]))
+            
+            # Analyze transactions
+            analysis = await asyncio.to_thread(file_parser.analyze_transactions, transactions)
+            logger.debug("Analysis complete: %d keys", len(analysis))
+            if len(transactions_db[user_id]) == len(transactions):
+                # First upload: this batch is the user's whole history, so the dashboard can reuse it
+                analysis_cache[user_id] = (len(transactions), analysis)
+            
+            # Update tax data with income information
+            if user_id in tax_data_db and 'income_analysis' in analysis:
+                tax_data_db[user_id].gross_income = analysis['income_analysis']['total'] * 12  # Annualized
         
         return {
             "message": "File processed successfully",
@@ -428,9 +493,7 @@ async def upload_file(user_id: str, file: UploadFile = File(...)):
         }
         
     except Exception as e:
-        print(f"Error processing file: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error processing file %s", file.filename)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing file: {str(e)}"
@@ -452,25 +515,28 @@ async def calculate_tax(user_id: str):
     taxable_old, tax_old = tax_calculator.calculate_old_regime_tax(tax_data)
     taxable_new, tax_new = tax_calculator.calculate_new_regime_tax(tax_data)
     
-    # Update tax data
-    tax_data.taxable_income_old = taxable_old
-    tax_data.taxable_income_new = taxable_new
-    tax_data.tax_old_regime = tax_old
-    tax_data.tax_new_regime = tax_new
-    tax_data.recommended_regime = tax_calculator.recommend_regime(tax_data)
+    # Update tax data; an unchanged recompute leaves the data version (and dashboard ETag) alone
+    computed = {
+        "taxable_income_old": taxable_old,
+        "taxable_income_new": taxable_new,
+        "tax_old_regime": tax_old,
+        "tax_new_regime": tax_new,
+        "recommended_regime": tax_calculator.recommend_regime(tax_data, tax_old, tax_new)
+    }
+    changed = False
+    for field, value in computed.items():
+        if getattr(tax_data, field) != value:
+            setattr(tax_data, field, value)
+            changed = True
+    if changed:
+        bump_data_version(user_id)
     
     return {
         "gross_income": tax_data.gross_income,
         "old_regime": {
             "taxable_income": taxable_old,
             "tax_payable": tax_old,
-            "deductions_claimed": (
-                tax_data.deduction_80c + tax_data.deduction_80d + 
-                tax_data.deduction_80g + tax_data.deduction_24b + 
-                tax_data.deduction_80e + tax_data.deduction_80tta +
-                tax_data.hra_exemption + tax_data.lta_exemption + 
-                tax_data.standard_deduction
-            )
+            "deductions_claimed": tax_calculator.claimed_deductions(tax_data)
         },
         "new_regime": {
             "taxable_income": taxable_new,
@@ -497,11 +563,33 @@ async def update_deductions(user_id: str, deductions: Dict):
     
     # Update deductions
     for key, value in deductions.items():
-        if hasattr(tax_data, f"deduction_{key}"):
-            setattr(tax_data, f"deduction_{key}", value)
+        attr = DEDUCTION_ATTRS.get(key)
+        if attr is not None:
+            setattr(tax_data, attr, value)
+    bump_data_version(user_id)
     
     return {"message": "Deductions updated successfully"}
 
+@app.post("/tax/recalculate-all")
+async def recalculate_all_taxes():
+    """Recompute both regimes for every user in one vectorised pass"""
+    user_ids = list(tax_data_db)
+    tax_data_list = [tax_data_db[user_id] for user_id in user_ids]
+    if not tax_data_list:
+        return {"updated": 0}
+    
+    results = tax_calculator.calculate_regime_taxes_batch(tax_data_list)
+    columns = {field: values.tolist() for field, values in results.items()}
+    for i, (user_id, tax_data) in enumerate(zip(user_ids, tax_data_list)):
+        for field, values in columns.items():
+            setattr(tax_data, field, values[i])
+        tax_data.recommended_regime = tax_calculator.recommend_regime(
+            tax_data, tax_data.tax_old_regime, tax_data.tax_new_regime
+        )
+        bump_data_version(user_id)
+    
+    return {"updated": len(tax_data_list)}
+
 @app.get("/tax/{user_id}/recommendations")
 async def get_tax_recommendations(user_id: str):
     """Get tax saving recommendations"""
@@ -538,8 +626,10 @@ async def get_cibil_score(user_id: str):
         # Update CIBIL data based on transaction analysis
         if credit_analysis.get('debt_to_income_ratio'):
             cibil_data.utilization_percentage = min(100, credit_analysis['debt_to_income_ratio'])
+            bump_data_version(user_id)
     
     score = cibil_advisor.calculate_score(cibil_data)
+    cibil_score_cache[user_id] = score
     category = cibil_advisor.get_score_category(score)
     
     return {
@@ -614,54 +704,89 @@ async def update_cibil_data(user_id: str, cibil_update: Dict):
     
     # Update CIBIL data
     for key, value in cibil_update.items():
-        if hasattr(cibil_data, key):
+        if key in CIBIL_ATTRS:
             setattr(cibil_data, key, value)
+    cibil_score_cache.pop(user_id, None)
+    bump_data_version(user_id)
     
     return {"message": "CIBIL data updated successfully"}
 
+def bump_data_version(user_id: str) -> None:
+    data_versions[user_id] = data_versions.get(user_id, 0) + 1
+
+def get_cached_cibil_score(user_id: str, cibil_data: CIBILData) -> int:
+    """Score from the last /cibil score or dashboard call; dropped when CIBIL data is updated"""
+    score = cibil_score_cache.get(user_id)
+    if score is None:
+        score = cibil_score_cache[user_id] = cibil_advisor.calculate_score(cibil_data)
+    return score
+
+def get_cached_analysis(user_id: str, transactions: List[Transaction]) -> Dict:
+    """Reuse the last analysis while the user's transaction list is unchanged"""
+    cached = analysis_cache.get(user_id)
+    if cached and cached[0] == len(transactions):
+        return cached[1]
+    analysis = file_parser.analyze_transactions(transactions)
+    analysis_cache[user_id] = (len(transactions), analysis)
+    return analysis
+
 # Dashboard endpoint
 @app.get("/dashboard/{user_id}")
-async def get_dashboard(user_id: str):
-    """Get comprehensive dashboard data"""
+async def get_dashboard(user_id: str, request: Request, response: Response, fields: Optional[str] = None):
+    """Get comprehensive dashboard data; ?fields=summary,tax_summary limits it to those sections"""
     if user_id not in users_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
+    # Polling clients get a 304 until an upload or tax/CIBIL update changes the inputs
+    requested = frozenset(fields.split(",")) if fields else None
+    etag = f'W/"{user_id}-{data_versions.get(user_id, 0)}-{len(transactions_db.get(user_id, []))}-{fields or ""}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     user = users_db[user_id]
     transactions = transactions_db.get(user_id, [])
     tax_data = tax_data_db.get(user_id)
     cibil_data = cibil_data_db.get(user_id)
     
-    # Prepare dashboard data
-    dashboard = {
-        "user": {
+    def wants(section: str) -> bool:
+        return requested is None or section in requested
+    
+    # Prepare dashboard data; sections that weren't asked for are never computed
+    dashboard = {}
+    if wants("user"):
+        dashboard["user"] = {
             "name": user.name,
             "email": user.email
-        },
-        "summary": {
+        }
+    if wants("summary"):
+        dashboard["summary"] = {
             "total_transactions": len(transactions),
             "tax_regime": tax_data.recommended_regime if tax_data else "new",
-            "cibil_score": cibil_advisor.calculate_score(cibil_data) if cibil_data else 750
-        },
-        "quick_stats": {}
-    }
-    
-    if transactions:
-        analysis = file_parser.analyze_transactions(transactions)
-        dashboard["financial_summary"] = {
-            "monthly_income": analysis.get("income_analysis", {}).get("average", 0),
-            "monthly_expense": analysis.get("expense_analysis", {}).get("average", 0),
-            "savings_rate": (
-                (analysis.get("income_analysis", {}).get("average", 0) - 
-                 analysis.get("expense_analysis", {}).get("average", 0)) / 
-                max(analysis.get("income_analysis", {}).get("average", 1), 1) * 100
-            )
+            "cibil_score": get_cached_cibil_score(user_id, cibil_data) if cibil_data else 750
         }
-        dashboard["monthly_trend"] = analysis.get("monthly_trend", {})
+    if wants("quick_stats"):
+        dashboard["quick_stats"] = {}
+    
+    if transactions and (wants("financial_summary") or wants("monthly_trend")):
+        analysis = get_cached_analysis(user_id, transactions)
+        if wants("financial_summary"):
+            dashboard["financial_summary"] = {
+                "monthly_income": analysis.get("income_analysis", {}).get("average", 0),
+                "monthly_expense": analysis.get("expense_analysis", {}).get("average", 0),
+                "savings_rate": (
+                    (analysis.get("income_analysis", {}).get("average", 0) - 
+                     analysis.get("expense_analysis", {}).get("average", 0)) / 
+                    max(analysis.get("income_analysis", {}).get("average", 1), 1) * 100
+                )
+            }
+        if wants("monthly_trend"):
+            dashboard["monthly_trend"] = analysis.get("monthly_trend", {})
     
-    if tax_data:
+    if tax_data and wants("tax_summary"):
         dashboard["tax_summary"] = {
             "estimated_tax": tax_data.tax_old_regime if tax_data.recommended_regime == "old" else tax_data.tax_new_regime,
             "potential_savings": abs((tax_data.tax_old_regime or 0) - (tax_data.tax_new_regime or 0))
@@ -670,14 +795,21 @@ async def get_dashboard(user_id: str):
     return dashboard
 
 # Health check endpoint
+# (epoch second, ISO timestamp) so frequent health probes reuse one string per second
+_health_timestamp = (0, "")
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    global _health_timestamp
+    second = int(time.time())
+    if _health_timestamp[0] != second:
+        _health_timestamp = (second, datetime.fromtimestamp(second).isoformat())
+    return {"status": "healthy", "timestamp": _health_timestamp[1]}
 
 @app.get("/api/profile")
-async def read_user_profile(current_user: dict = Depends(get_current_user)):
-    # Example: Fetch user-specific data using current_user["id"]
-    return {"message": "Authenticated!", "user_id": current_user["id"]}
+async def read_user_profile(current_user: CurrentUser = Depends(get_current_user)):
+    # Example: Fetch user-specific data using current_user.id
+    return {"message": "Authenticated!", "user_id": current_user.id}
 
 from app.services.capital_gains_service import CapitalGainsService
 from fastapi import APIRouter, UploadFile, File, Form
@@ -688,7 +820,7 @@ user_gains = {}
 
 @capital_gains_router.post('/capital_gains/ingest')
 async def ingest_gains(user_id: str = Form(...), file: UploadFile = File(...)):
-    content = await file.read()
+    content = upload_stream(file)
     gains = capital_gains_service.ingest(user_id, content, file.filename)
     user_gains[user_id] = gains
     return {'success': True, 'count': len(gains)}
@@ -696,7 +828,7 @@ async def ingest_gains(user_id: str = Form(...), file: UploadFile = File(...)):
 @capital_gains_router.get('/capital_gains/list')
 async def list_gains(user_id: str):
     gains = user_gains.get(user_id, [])
-    return {'gains': [vars(g) for g in gains]}
+    return FastJSONResponse({'gains': [g.to_dict() for g in gains]})
 
 @capital_gains_router.post('/capital_gains/analyze')
 async def analyze_gains(user_id: str = Form(...)):
@@ -711,9 +843,17 @@ async def chat_with_ai(payload: dict):
     question = payload.get("message", "")
     if not question:
         return {"reply": "Please enter a message."}
-    reply = ask_gemini(question)
+    reply = await ask_gemini(question)
     return {"reply": reply}
 
+@app.post("/chat/stream")
+async def stream_chat_with_ai(payload: dict):
+    """Same as /chat, but sends the reply as plain text while it is generated"""
+    question = payload.get("message", "")
+    if not question:
+        return {"reply": "Please enter a message."}
+    return StreamingResponse(stream_gemini(question), media_type="text/plain")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from enum import Enum
 
 class UserRole(str, Enum):
@@ -135,6 +135,8 @@ class FileUpload(BaseModel):
     processed_at: Optional[datetime] = None
 
 class TaxRecommendation(BaseModel):
+    model_config = ConfigDict(frozen=True)  # built once per advice run, never mutated
+
     category: str
     title: str
     description: str
@@ -143,6 +145,8 @@ class TaxRecommendation(BaseModel):
     action_required: str
 
 class CIBILRecommendation(BaseModel):
+    model_config = ConfigDict(frozen=True)  # built once per advice run, never mutated
+
     category: str
     title: str
     current_impact: str  # positive, negative, neutral
@@ -2,6 +2,9 @@ from typing import Optional
 from datetime import datetime
 
 class Debt:
+    # Many instances live in the in-memory store; slots drop the per-instance __dict__
+    __slots__ = ('id', 'user_id', 'lender', 'principal', 'interest_rate', 'tenure_months', 'emi', 'start_date', 'type')
+
     def __init__(self, id: Optional[int], user_id: Optional[int], lender: str, principal: float, interest_rate: float, tenure_months: int, emi: float, start_date: datetime, type: str):
         self.id = id
         self.user_id = user_id
@@ -11,4 +14,7 @@ class Debt:
         self.tenure_months = tenure_months
         self.emi = emi
         self.start_date = start_date
-        self.type = type  # 'loan' or 'credit_card'
\ No newline at end of file
+        self.type = type  # 'loan' or 'credit_card'
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
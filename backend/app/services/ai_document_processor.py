@@ -1,9 +1,20 @@
+import asyncio
 import os
 import io
 import re
-from typing import Dict, Any, Optional, List
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from datetime import datetime
-import base64
+import copy
+import hashlib
+import itertools
+
+import orjson
 
 try:
     import openai
@@ -11,11 +22,19 @@ try:
 except ImportError:
     HAS_OPENAI = False
 
+try:
+    import pypdfium2 as pdfium
+    HAS_PDFIUM = True
+except ImportError:
+    HAS_PDFIUM = False
+
 try:
     import pdfplumber
-    HAS_PDF = True
+    HAS_PDFPLUMBER = True
 except ImportError:
-    HAS_PDF = False
+    HAS_PDFPLUMBER = False
+
+HAS_PDF = HAS_PDFIUM or HAS_PDFPLUMBER
 
 try:
     from PIL import Image
@@ -25,6 +44,250 @@ except ImportError:
 
 from app.models.database import DocumentType
 
+EXTRACTION_PROMPT_TEMPLATE = """
+        Analyze the following {document_type} document text and extract key information.
+        Return the data as JSON.
+        
+        Document Text:
+        {text}
+        
+        Extract the following if available:
+        {fields}
+        
+        Respond with a single JSON object keyed by snake_case field names
+        (e.g. document_number, name, expiry_date). Write dates as DD/MM/YYYY
+        and leave out fields that are not present."""
+
+# Per-type field lists, joined once at import
+EXTRACTION_FIELDS = {
+    document_type: "\n".join(fields)
+    for document_type, fields in {
+        DocumentType.PAN_CARD: [
+            "- PAN number (format: AAAAA9999A)",
+            "- Full name",
+            "- Father's name",
+            "- Date of birth"
+        ],
+        DocumentType.AADHAAR: [
+            "- Aadhaar number (12 digits)",
+            "- Full name",
+            "- Date of birth",
+            "- Gender",
+            "- Address"
+        ],
+        DocumentType.PASSPORT: [
+            "- Passport number",
+            "- Full name",
+            "- Date of birth",
+            "- Issue date",
+            "- Expiry date",
+            "- Nationality"
+        ],
+        DocumentType.INSURANCE_POLICY: [
+            "- Policy number",
+            "- Policy holder name",
+            "- Premium amount",
+            "- Sum assured",
+            "- Policy start date",
+            "- Policy end date",
+            "- Next premium due date"
+        ]
+    }.items()
+}
+
+# Deletes rupee signs and thousands separators from amounts
+CURRENCY_STRIP_TABLE = str.maketrans('', '', '₹,')
+
+# Single-card documents carry every field on the first page or two, so PDF text
+# extraction stops once all their patterns have matched
+EARLY_EXIT_DOCUMENT_TYPES = frozenset({
+    DocumentType.PAN_CARD, DocumentType.AADHAAR, DocumentType.PASSPORT, DocumentType.DRIVING_LICENSE
+})
+
+DATE_FORMATS = (
+    "%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d",
+    "%d/%m/%y", "%d-%m-%y", "%y-%m-%d"
+)
+# Digit widths strptime accepts per directive; a format can only match a date whose
+# component widths fit, so _parse_date tries just those (usually exactly one)
+_DIRECTIVE_WIDTHS = {"%d": (1, 2), "%m": (1, 2), "%Y": (4, 4), "%y": (2, 2)}
+DATE_SHAPE_RE = re.compile(r"(\d{1,4})([/-])(\d{1,4})\2(\d{1,4})")
+
+def _build_date_formats_by_shape() -> Dict[tuple, List[str]]:
+    """(separator, component widths) -> DATE_FORMATS entries that could parse it, in order"""
+    by_shape = {}
+    for fmt in DATE_FORMATS:
+        sep = fmt[2]
+        allowed = [range(lo, hi + 1) for lo, hi in (_DIRECTIVE_WIDTHS[d] for d in fmt.split(sep))]
+        for widths in itertools.product(*allowed):
+            by_shape.setdefault((sep, widths), []).append(fmt)
+    return by_shape
+
+_DATE_FORMATS_BY_SHAPE = _build_date_formats_by_shape()
+
+# Regex fields sit near the top of the document; only this much text is scanned for them
+REGEX_SCAN_CHARS = 4096
+REGEX_SCAN_CHARS_BY_TYPE = {DocumentType.INSURANCE_POLICY: 8192}
+
+# PDFium is not thread-safe, so text extraction through it is serialised per process
+_pdfium_lock = threading.Lock()
+
+def _pdfium_page_texts(pdf, start: int, end: int) -> Iterator[str]:
+    """Non-empty page texts of an open PdfDocument; the caller holds _pdfium_lock"""
+    for index in range(start, end):
+        page = pdf[index]
+        textpage = page.get_textpage()
+        page_text = textpage.get_text_bounded().replace("\r\n", "\n")
+        textpage.close()
+        page.close()
+        # Image-only (scanned) pages have no text layer
+        if page_text.strip():
+            yield page_text
+
+def _pdfplumber_page_texts(pdf) -> Iterator[str]:
+    for page in pdf.pages:
+        page_text = page.extract_text()
+        if page_text:
+            yield page_text
+
+def _iter_pdf_pages(content: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each non-empty page in [start, end), extracting lazily.
+
+    Uses PDFium's native text layer when available; pdfplumber (pure-Python
+    pdfminer plus layout analysis) is the fallback.
+    """
+    if HAS_PDFIUM:
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(content)
+            try:
+                yield from _pdfium_page_texts(pdf, start, len(pdf) if end is None else end)
+            finally:
+                pdf.close()
+        return
+    pages = None if start == 0 and end is None else list(range(start + 1, end + 1))
+    with pdfplumber.open(io.BytesIO(content), pages=pages) as pdf:
+        yield from _pdfplumber_page_texts(pdf)
+
+def _read_pdf_if_short(content: bytes) -> Tuple[int, Optional[List[str]]]:
+    """Page count, plus every page's text when below PDF_POOL_MIN_PAGES, from a single open"""
+    if HAS_PDFIUM:
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(content)
+            try:
+                page_count = len(pdf)
+                if page_count >= PDF_POOL_MIN_PAGES:
+                    return page_count, None
+                return page_count, list(_pdfium_page_texts(pdf, 0, page_count))
+            finally:
+                pdf.close()
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        page_count = len(pdf.pages)
+        if page_count >= PDF_POOL_MIN_PAGES:
+            return page_count, None
+        return page_count, list(_pdfplumber_page_texts(pdf))
+
+# Longer PDFs are split into page ranges parsed in worker processes (text extraction
+# holds the GIL or the PDFium lock); below this the process hop costs more than it saves
+PDF_POOL_MIN_PAGES = 4
+PDF_POOL_WORKERS = os.cpu_count() or 1
+# Backstop for a stuck worker; the whole document's page ranges must finish within this
+PDF_POOL_TIMEOUT_SECONDS = 60
+_pdf_pool = None
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Lazily start the shared PDF worker pool on first use.
+
+    Workers come from a forkserver, not a fork of this process: a fork taken while a
+    to_thread worker holds _pdfium_lock would start with that lock held forever.
+    """
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_POOL_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+        )
+    return _pdf_pool
+
+def _discard_pdf_pool() -> None:
+    """Kill the shared pool's workers and drop it so later jobs start on fresh ones"""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        # shutdown() only cancels queued jobs; a worker stuck mid-job has to be killed
+        workers = list((getattr(_pdf_pool, "_processes", None) or {}).values())
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.kill()
+        _pdf_pool = None
+
+def shutdown_pdf_pool() -> None:
+    """Stop the shared PDF worker pool, if started; called from the app shutdown hooks"""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=True, cancel_futures=True)
+        _pdf_pool = None
+
+def _extract_page_range(content: bytes, start: int, end: int) -> List[str]:
+    """Text of the non-empty pages in [start, end) (0-based); runs in a pool worker"""
+    return list(_iter_pdf_pages(content, start, end))
+
+# _calculate_confidence() inputs
+CONFIDENCE_EXPECTED_FIELDS = 5  # Average expected fields
+CRITICAL_FIELDS = frozenset({"document_number", "expiry_date", "name"})
+CRITICAL_FIELDS_BOOST = 0.3
+
+DATE_FIELDS = ("expiry_date", "issue_date", "date_of_birth")
+
+# Regex-only confidence at or above which the AI extraction call is skipped
+AI_CONFIDENCE_THRESHOLD = 0.8
+
+# Parsed AI extractions keyed by SHA-256(prompt); re-uploads of the same document skip the API call
+EXTRACTION_CACHE_MAX_SIZE = 256
+_extraction_cache = {}
+
+# Extraction output (raw text, structured data, method) keyed by (BLAKE2b(content), file_type,
+# document_type) -> (expires_at, raw_text, structured_data, extraction_method); duplicate scans
+# and retried uploads skip text extraction, regexes and the AI call. Insights depend on today's
+# date, so they are rebuilt on every hit rather than cached.
+RESULT_CACHE_MAX_SIZE = 512
+RESULT_CACHE_TTL_SECONDS = 3600
+_result_cache = {}
+
+# Fixed per-type advice appended by _generate_insights()
+TYPE_RECOMMENDATIONS = {
+    DocumentType.INSURANCE_POLICY: (
+        "Set up automatic premium payment",
+        "Review coverage annually",
+        "Keep beneficiary information updated"
+    ),
+    DocumentType.LOAN_AGREEMENT: (
+        "Set up EMI reminders",
+        "Track interest rate changes",
+        "Monitor prepayment options"
+    )
+}
+
+RENEWAL_REMINDER_DAYS = (90, 60, 30, 15, 7, 1)  # days before expiry
+
+RELATED_DOCUMENTS = {
+    DocumentType.PAN_CARD: ("Form 16", "ITR", "Bank Statements", "Salary Slips"),
+    DocumentType.AADHAAR: ("PAN Card", "Passport", "Voter ID", "Driving License"),
+    DocumentType.INSURANCE_POLICY: ("Medical Records", "Nominee KYC", "Previous Policy Documents"),
+    DocumentType.LOAN_AGREEMENT: ("Property Papers", "Income Documents", "Bank Statements", "Insurance Policy")
+}
+
+
+@lru_cache(maxsize=None)
+def _extraction_prompt_parts(document_type: DocumentType) -> Tuple[str, str]:
+    """The prompt around the document text for a type, formatted once; the constant
+    prefix also keeps requests eligible for OpenAI's prompt caching"""
+    marker = "\x00"
+    prompt = EXTRACTION_PROMPT_TEMPLATE.format(
+        document_type=document_type.value,
+        text=marker,
+        fields=EXTRACTION_FIELDS.get(document_type, "- Key document information"),
+    )
+    head, tail = prompt.split(marker)
+    return head, tail
+
 
 class AIDocumentProcessor:
     """
@@ -34,8 +297,10 @@ class AIDocumentProcessor:
     
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        if self.openai_api_key and HAS_OPENAI:
-            openai.api_key = self.openai_api_key
+        # Async client so awaiting the completion yields the event loop to other requests
+        self._openai_client = (
+            openai.AsyncOpenAI(api_key=self.openai_api_key) if self.openai_api_key and HAS_OPENAI else None
+        )
         
         # Document type specific extraction patterns
         self.extraction_patterns = {
@@ -69,6 +334,26 @@ class AIDocumentProcessor:
                 "sum_assured": r"Sum\s*Assured\s*:?\s*₹?\s*([\d,]+)"
             }
         }
+        # Literal (lowercase) text a pattern cannot match without; fields whose
+        # anchor is absent from the document skip their regex entirely
+        self.extraction_anchors = {
+            DocumentType.PAN_CARD: {"name": "name", "father_name": "father's name"},
+            DocumentType.AADHAAR: {"date_of_birth": "dob"},
+            DocumentType.PASSPORT: {"nationality": "ind"},
+            DocumentType.INSURANCE_POLICY: {
+                "policy_number": "policy", "premium_amount": "premium", "sum_assured": "assured"
+            }
+        }
+        
+        # Compiled once here rather than re-parsed for every document; no pattern
+        # anchors on ^/$, so MULTILINE isn't needed
+        self._compiled_patterns = {
+            document_type: [
+                (field, re.compile(pattern, re.IGNORECASE), self.extraction_anchors.get(document_type, {}).get(field))
+                for field, pattern in patterns.items()
+            ]
+            for document_type, patterns in self.extraction_patterns.items()
+        }
 
     async def extract_document_data(
         self, 
@@ -79,21 +364,44 @@ class AIDocumentProcessor:
         """
         Extract structured data from document using OCR and AI.
         """
+        cache_key = (hashlib.blake2b(content).digest(), file_type, document_type)
+        
         try:
-            # Extract text from document
-            raw_text = await self._extract_text(content, file_type)
-            
-            if not raw_text:
-                return None
-            
-            # Apply regex patterns for basic extraction
-            basic_extraction = self._apply_regex_patterns(raw_text, document_type)
-            
-            # Use AI for advanced extraction if available
-            ai_extraction = await self._ai_extract_data(raw_text, document_type)
-            
-            # Combine and clean data
-            combined_data = {**basic_extraction, **ai_extraction}
+            cached = _result_cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                # Copied out so callers can't mutate the cached data
+                _, raw_text, combined_data, extraction_method = cached
+                combined_data = copy.deepcopy(combined_data)
+            else:
+                _result_cache.pop(cache_key, None)
+                
+                # Extract text from document
+                raw_text = await self._extract_text(content, file_type, document_type)
+                
+                if not raw_text:
+                    return None
+                
+                # Apply regex patterns for basic extraction
+                basic_extraction = self._apply_regex_patterns(raw_text, document_type)
+                
+                # Use AI for advanced extraction if available and the regexes fell short
+                if self._calculate_confidence(basic_extraction) >= AI_CONFIDENCE_THRESHOLD:
+                    ai_extraction = {}
+                else:
+                    ai_extraction = await self._ai_extract_data(raw_text, document_type)
+                
+                # Combine and clean data
+                combined_data = {**basic_extraction, **(ai_extraction or {})}
+                extraction_method = "ai+regex" if ai_extraction else "regex"
+                
+                # A failed AI call (None) is transient; don't pin its regex-only result
+                if ai_extraction is not None:
+                    if len(_result_cache) >= RESULT_CACHE_MAX_SIZE:
+                        del _result_cache[next(iter(_result_cache))]
+                    _result_cache[cache_key] = (
+                        time.monotonic() + RESULT_CACHE_TTL_SECONDS,
+                        raw_text, copy.deepcopy(combined_data), extraction_method
+                    )
             
             # Generate insights and suggestions
             insights = await self._generate_insights(combined_data, document_type)
@@ -103,18 +411,22 @@ class AIDocumentProcessor:
                 "structured_data": combined_data,
                 "insights": insights,
                 "confidence_score": self._calculate_confidence(combined_data),
-                "extraction_method": "ai+regex" if ai_extraction else "regex"
+                "extraction_method": extraction_method
             }
             
         except Exception as e:
             print(f"Document processing error: {str(e)}")
             return None
 
-    async def _extract_text(self, content: bytes, file_type: str) -> Optional[str]:
+    async def _extract_text(
+        self, content: bytes, file_type: str, document_type: Optional[DocumentType] = None
+    ) -> Optional[str]:
         """Extract raw text from different file types."""
         try:
             if file_type == "application/pdf" and HAS_PDF:
-                return self._extract_pdf_text(content)
+                if document_type not in EARLY_EXIT_DOCUMENT_TYPES:
+                    return await self._extract_pdf_text_parallel(content)
+                return await asyncio.to_thread(self._extract_pdf_text, content, document_type)
             elif file_type.startswith("image/") and HAS_PIL:
                 return await self._extract_image_text(content)
             else:
@@ -127,15 +439,41 @@ class AIDocumentProcessor:
             print(f"Text extraction error: {str(e)}")
             return None
 
-    def _extract_pdf_text(self, content: bytes) -> str:
-        """Extract text from PDF using pdfplumber."""
+    async def _extract_pdf_text_parallel(self, content: bytes) -> str:
+        """Extract text from every PDF page, fanning page ranges out to worker processes."""
+        # Short documents are read while the page count is taken, instead of opening them twice
+        page_count, page_texts = await asyncio.to_thread(_read_pdf_if_short, content)
+        if page_texts is not None:
+            return "\n".join(page_texts)
+        
+        pool = _get_pdf_pool()
+        chunk_size = -(-page_count // PDF_POOL_WORKERS)
+        loop = asyncio.get_running_loop()
+        try:
+            chunks = await asyncio.wait_for(asyncio.gather(*(
+                loop.run_in_executor(pool, _extract_page_range, content, start, min(start + chunk_size, page_count))
+                for start in range(0, page_count, chunk_size)
+            )), timeout=PDF_POOL_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            if _pdf_pool is pool:
+                _discard_pdf_pool()
+            raise
+        return "\n".join(text for chunk in chunks for text in chunk)
+
+    def _extract_pdf_text(self, content: bytes, document_type: Optional[DocumentType] = None) -> str:
+        """Extract text from PDF (PDFium, falling back to pdfplumber)."""
         text_content = []
+        patterns = self._compiled_patterns.get(document_type) if document_type in EARLY_EXIT_DOCUMENT_TYPES else None
         
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append(page_text)
+        with closing(_iter_pdf_pages(content)) as pages:
+            for page_text in pages:
+                text_content.append(page_text)
+                if patterns:
+                    text_so_far = "\n".join(text_content)
+                    # Done once every field matched, or once past what the regexes would scan
+                    if (len(text_so_far) >= REGEX_SCAN_CHARS
+                            or all(regex.search(text_so_far) for _, regex, _ in patterns)):
+                        break
         
         return "\n".join(text_content)
 
@@ -152,17 +490,21 @@ class AIDocumentProcessor:
 
     def _apply_regex_patterns(self, text: str, document_type: DocumentType) -> Dict[str, Any]:
         """Apply regex patterns to extract structured data."""
-        patterns = self.extraction_patterns.get(document_type, {})
         extracted = {}
+        text = text[:REGEX_SCAN_CHARS_BY_TYPE.get(document_type, REGEX_SCAN_CHARS)]
+        lowered = text.lower()
         
-        for field, pattern in patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                value = matches[0] if isinstance(matches[0], str) else matches[0][0]
+        for field, regex, anchor in self._compiled_patterns.get(document_type, ()):
+            if anchor is not None and anchor not in lowered:
+                continue
+            # First match only; search() stops there instead of collecting them all
+            match = regex.search(text)
+            if match:
+                value = match.group(1) if regex.groups else match.group(0)
                 extracted[field] = self._clean_extracted_value(field, value)
         
         # Parse dates
-        for field in ["expiry_date", "issue_date", "date_of_birth"]:
+        for field in DATE_FIELDS:
             if field in extracted:
                 extracted[field] = self._parse_date(extracted[field])
         
@@ -174,10 +516,10 @@ class AIDocumentProcessor:
         
         if field == "document_number":
             # Remove spaces and normalize
-            return re.sub(r'\s+', '', value.upper())
+            return ''.join(value.upper().split())
         elif field in ["premium_amount", "sum_assured"]:
             # Remove currency symbols and commas
-            return re.sub(r'[₹,]', '', value).strip()
+            return value.translate(CURRENCY_STRIP_TABLE).strip()
         elif field == "name":
             # Title case for names
             return ' '.join(word.capitalize() for word in value.split())
@@ -186,10 +528,12 @@ class AIDocumentProcessor:
 
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse date string into datetime object."""
-        date_formats = [
-            "%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d",
-            "%d/%m/%y", "%d-%m-%y", "%y-%m-%d"
-        ]
+        shape = DATE_SHAPE_RE.fullmatch(date_str)
+        if shape:
+            widths = (len(shape.group(1)), len(shape.group(3)), len(shape.group(4)))
+            date_formats = _DATE_FORMATS_BY_SHAPE.get((shape.group(2), widths), ())
+        else:
+            date_formats = DATE_FORMATS
         
         for fmt in date_formats:
             try:
@@ -199,15 +543,18 @@ class AIDocumentProcessor:
         
         return None
 
-    async def _ai_extract_data(self, text: str, document_type: DocumentType) -> Dict[str, Any]:
-        """Use OpenAI to extract structured data from text."""
-        if not self.openai_api_key or not HAS_OPENAI:
+    async def _ai_extract_data(self, text: str, document_type: DocumentType) -> Optional[Dict[str, Any]]:
+        """Use OpenAI to extract structured data from text; None when the API call failed."""
+        if self._openai_client is None:
             return {}
         
         try:
             prompt = self._create_extraction_prompt(text, document_type)
+            cache_key = hashlib.sha256(prompt.encode()).hexdigest()
+            if cache_key in _extraction_cache:
+                return _extraction_cache[cache_key]
             
-            response = openai.ChatCompletion.create(
+            response = await self._openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -220,72 +567,46 @@ class AIDocumentProcessor:
                     }
                 ],
                 temperature=0.1,
-                max_tokens=500
+                max_tokens=500,
+                response_format={"type": "json_object"}
             )
             
-            # Parse AI response (would need proper JSON parsing in production)
             ai_data = self._parse_ai_response(response.choices[0].message.content)
+            if len(_extraction_cache) >= EXTRACTION_CACHE_MAX_SIZE:
+                del _extraction_cache[next(iter(_extraction_cache))]
+            _extraction_cache[cache_key] = ai_data
             return ai_data
             
         except Exception as e:
             print(f"AI extraction error: {str(e)}")
-            return {}
+            return None
 
     def _create_extraction_prompt(self, text: str, document_type: DocumentType) -> str:
         """Create extraction prompt based on document type."""
-        base_prompt = f"""
-        Analyze the following {document_type.value} document text and extract key information.
-        Return the data in a structured format.
-        
-        Document Text:
-        {text[:2000]}  # Limit text to avoid token limits
-        
-        Extract the following if available:
-        """
-        
-        type_specific_fields = {
-            DocumentType.PAN_CARD: [
-                "- PAN number (format: AAAAA9999A)",
-                "- Full name",
-                "- Father's name",
-                "- Date of birth"
-            ],
-            DocumentType.AADHAAR: [
-                "- Aadhaar number (12 digits)",
-                "- Full name", 
-                "- Date of birth",
-                "- Gender",
-                "- Address"
-            ],
-            DocumentType.PASSPORT: [
-                "- Passport number",
-                "- Full name",
-                "- Date of birth",
-                "- Issue date",
-                "- Expiry date",
-                "- Nationality"
-            ],
-            DocumentType.INSURANCE_POLICY: [
-                "- Policy number",
-                "- Policy holder name",
-                "- Premium amount",
-                "- Sum assured",
-                "- Policy start date",
-                "- Policy end date",
-                "- Next premium due date"
-            ]
-        }
-        
-        fields = type_specific_fields.get(document_type, ["- Key document information"])
-        base_prompt += "\n".join(fields)
-        
-        return base_prompt
+        head, tail = _extraction_prompt_parts(document_type)
+        # Limit text to avoid token limits
+        return f"{head}{text[:2000]}{tail}"
 
     def _parse_ai_response(self, response: str) -> Dict[str, Any]:
-        """Parse AI response into structured data."""
-        # Placeholder for AI response parsing
-        # In production, you'd parse the structured response properly
-        return {}
+        """Parse the JSON-mode AI response into structured data."""
+        try:
+            data = orjson.loads(response or "")
+        except orjson.JSONDecodeError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        
+        parsed = {}
+        for field, value in data.items():
+            # Empty values would otherwise overwrite what the regexes found
+            if value is None or value == "" or value == []:
+                continue
+            if field in DATE_FIELDS and isinstance(value, str):
+                value = self._parse_date(value)
+                if value is None:
+                    continue
+            parsed[field] = value
+        return parsed
 
     async def _generate_insights(self, extracted_data: Dict[str, Any], document_type: DocumentType) -> Dict[str, Any]:
         """Generate insights and recommendations based on extracted data."""
@@ -312,18 +633,7 @@ class AIDocumentProcessor:
                     insights["recommendations"].append("Document expires in 3 months. Plan for renewal.")
         
         # Document-specific insights
-        if document_type == DocumentType.INSURANCE_POLICY:
-            insights["recommendations"].extend([
-                "Set up automatic premium payment",
-                "Review coverage annually",
-                "Keep beneficiary information updated"
-            ])
-        elif document_type == DocumentType.LOAN_AGREEMENT:
-            insights["recommendations"].extend([
-                "Set up EMI reminders",
-                "Track interest rate changes",
-                "Monitor prepayment options"
-            ])
+        insights["recommendations"].extend(TYPE_RECOMMENDATIONS.get(document_type, ()))
         
         return insights
 
@@ -333,15 +643,11 @@ class AIDocumentProcessor:
             return 0.0
         
         # Simple confidence calculation based on number of fields extracted
-        total_possible_fields = 5  # Average expected fields
-        extracted_fields = len(extracted_data)
-        
-        base_confidence = min(extracted_fields / total_possible_fields, 1.0)
+        base_confidence = min(len(extracted_data) / CONFIDENCE_EXPECTED_FIELDS, 1.0)
         
         # Boost confidence if critical fields are present
-        critical_fields = ["document_number", "expiry_date", "name"]
-        critical_found = sum(1 for field in critical_fields if field in extracted_data)
-        critical_boost = critical_found / len(critical_fields) * 0.3
+        critical_found = len(CRITICAL_FIELDS & extracted_data.keys())
+        critical_boost = critical_found / len(CRITICAL_FIELDS) * CRITICAL_FIELDS_BOOST
         
         return min(base_confidence + critical_boost, 1.0)
 
@@ -353,15 +659,16 @@ class AIDocumentProcessor:
             expiry_date = extracted_data["expiry_date"]
             if isinstance(expiry_date, datetime):
                 # Create reminders at different intervals
-                reminder_intervals = [90, 60, 30, 15, 7, 1]  # days before expiry
+                now = datetime.now()
+                description = f"Your {document_type.value} will expire on {expiry_date.strftime('%Y-%m-%d')}"
                 
-                for days_before in reminder_intervals:
+                for days_before in RENEWAL_REMINDER_DAYS:
                     reminder_date = expiry_date - timedelta(days=days_before)
-                    if reminder_date > datetime.now():
+                    if reminder_date > now:
                         reminders.append({
                             "reminder_date": reminder_date,
                             "title": f"{document_type.value} expires in {days_before} days",
-                            "description": f"Your {document_type.value} will expire on {expiry_date.strftime('%Y-%m-%d')}",
+                            "description": description,
                             "urgency": "high" if days_before <= 30 else "medium"
                         })
         
@@ -369,23 +676,6 @@ class AIDocumentProcessor:
 
     async def suggest_related_documents(self, document_type: DocumentType, extracted_data: Dict[str, Any]) -> List[str]:
         """Suggest related documents that user might need."""
-        suggestions = []
-        
-        related_docs = {
-            DocumentType.PAN_CARD: [
-                "Form 16", "ITR", "Bank Statements", "Salary Slips"
-            ],
-            DocumentType.AADHAAR: [
-                "PAN Card", "Passport", "Voter ID", "Driving License"
-            ],
-            DocumentType.INSURANCE_POLICY: [
-                "Medical Records", "Nominee KYC", "Previous Policy Documents"
-            ],
-            DocumentType.LOAN_AGREEMENT: [
-                "Property Papers", "Income Documents", "Bank Statements", "Insurance Policy"
-            ]
-        }
-        
-        return related_docs.get(document_type, [])
+        return list(RELATED_DOCUMENTS.get(document_type, ()))
 
 from datetime import timedelta
\ No newline at end of file
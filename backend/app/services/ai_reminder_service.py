@@ -1,9 +1,13 @@
 import os
-import uuid
 import asyncio
+import calendar
+import hashlib
+import heapq
+import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+import orjson
 
 try:
     import openai
@@ -11,11 +15,170 @@ try:
 except ImportError:
     HAS_OPENAI = False
 
+from app.core.ids import new_ids
 from app.models.database import (
     Document, DocumentReminder, DocumentType, ReminderType, 
     ReminderFrequency, DocumentStatus
 )
 
+logger = logging.getLogger(__name__)
+
+# All fixed instructions live in the system prompts so they form an identical, cacheable
+# prefix on every request; the user message carries only a compact JSON blob of the
+# per-document fields
+ANALYSIS_SYSTEM_PROMPT = (
+    "You are an expert document management advisor. Provide practical, actionable insights "
+    "for document renewals considering Indian regulatory requirements and user convenience. "
+    "The user message is a JSON object describing one document: type, expiry (YYYY-MM-DD or null), "
+    "status, num (document number or null) and ctx (user context or null). "
+    "Respond with a JSON object with exactly these keys: "
+    "\"priority_boost\": integer 0-3, how much to increase the base priority; "
+    "\"additional_actions\": list of short action strings beyond standard renewal; "
+    "\"reasoning\": one or two sentences, including any seasonal or timing considerations."
+)
+
+# Upper bound on the analysis reply's priority_boost, matching the 0-3 range the prompt asks for
+ANALYSIS_MAX_PRIORITY_BOOST = 3
+
+CONTENT_SYSTEM_PROMPT = (
+    "Generate clear, concise reminder messages that motivate users to take action. "
+    "The user message is a JSON object with the document name (doc), days until expiry (days) "
+    "and urgency. Respond with a JSON object with exactly these keys: "
+    "\"title\": brief, clear title (max 60 characters); "
+    "\"description\": helpful, action-oriented description with next steps (max 150 characters)."
+)
+
+# Per-type lookup tables; built once here, treat as read-only
+DOCUMENT_TYPE_NAMES = {dt: dt.value.replace('_', ' ').title() for dt in DocumentType}
+
+REMINDER_SCHEDULES = {
+    DocumentType.PAN_CARD: {
+        365: {"importance": "high", "type": "annual_check"},
+        180: {"importance": "medium", "type": "preparation"},
+        90: {"importance": "high", "type": "urgent"},
+        30: {"importance": "critical", "type": "immediate"},
+        7: {"importance": "critical", "type": "last_chance"}
+    },
+    DocumentType.PASSPORT: {
+        365: {"importance": "high", "type": "early_renewal"},
+        180: {"importance": "high", "type": "process_start"},
+        90: {"importance": "high", "type": "urgent"},
+        30: {"importance": "critical", "type": "emergency"},
+        15: {"importance": "critical", "type": "expedite"}
+    },
+    DocumentType.INSURANCE_POLICY: {
+        60: {"importance": "medium", "type": "review"},
+        30: {"importance": "high", "type": "renewal"},
+        15: {"importance": "high", "type": "payment_due"},
+        7: {"importance": "critical", "type": "urgent"},
+        3: {"importance": "critical", "type": "last_chance"}
+    },
+    DocumentType.DRIVING_LICENSE: {
+        90: {"importance": "medium", "type": "preparation"},
+        30: {"importance": "high", "type": "renewal"},
+        15: {"importance": "high", "type": "urgent"},
+        7: {"importance": "critical", "type": "immediate"}
+    }
+}
+
+DEFAULT_REMINDER_SCHEDULE = {
+    30: {"importance": "medium", "type": "renewal"},
+    7: {"importance": "high", "type": "urgent"}
+}
+
+DEFAULT_ACTIONS = {
+    DocumentType.PAN_CARD: (
+        "Visit NSDL or UTIITSL website",
+        "Keep Aadhaar card ready",
+        "Prepare passport size photo"
+    ),
+    DocumentType.PASSPORT: (
+        "Book appointment on Passport Seva website",
+        "Gather required documents",
+        "Pay applicable fees online"
+    ),
+    DocumentType.DRIVING_LICENSE: (
+        "Visit RTO website for online renewal",
+        "Prepare medical certificate if required",
+        "Keep existing license ready"
+    ),
+    DocumentType.INSURANCE_POLICY: (
+        "Review current coverage",
+        "Compare renewal with other providers",
+        "Set up automatic payment if needed"
+    )
+}
+
+RENEWAL_COST_ESTIMATES = {
+    DocumentType.PAN_CARD: 110.0,  # Re-issue fee
+    DocumentType.PASSPORT: 1500.0,  # Normal processing
+    DocumentType.DRIVING_LICENSE: 200.0,  # Renewal fee
+    DocumentType.INSURANCE_POLICY: None,  # Varies too much
+    DocumentType.LOAN_AGREEMENT: None  # Not applicable
+}
+
+# Document types each seasonal factor applies to in _calculate_base_priority()
+SEASON_DOCUMENT_TYPES = {
+    "tax_season": (DocumentType.PAN_CARD, DocumentType.ITR),
+    "travel_season": (DocumentType.PASSPORT,)
+}
+
+# Reminders shown per dashboard section, picked by _reminder_rank()
+DASHBOARD_URGENT_LIMIT = 5
+DASHBOARD_UPCOMING_LIMIT = 10
+
+# Default for the OPENAI_CONCURRENCY env var: max OpenAI requests in flight per process
+DEFAULT_OPENAI_CONCURRENCY = 20
+
+# Successful AI responses keyed by SHA-256(prompt): many documents share a type, urgency
+# and day bucket, so the same prompt recurs; evicted oldest-first past the max size
+AI_RESPONSE_CACHE_MAX_SIZE = 512
+_ai_analysis_cache = {}
+_ai_content_cache = {}
+
+# Document types that get premium payment reminders in _create_special_reminders()
+INSURANCE_DOCUMENT_TYPES = frozenset({
+    DocumentType.INSURANCE_POLICY,
+    DocumentType.HEALTH_INSURANCE,
+    DocumentType.LIFE_INSURANCE,
+    DocumentType.VEHICLE_INSURANCE
+})
+
+EMI_REMINDER_MONTHS = 6
+EMI_REMINDER_DAYS_BEFORE = (3, 1)
+PREMIUM_REMINDER_DAYS_BEFORE = (45, 30, 15, 7, 1)
+# Actions attached to every EMI / premium reminder; DocumentReminder copies the list on validation
+EMI_ACTIONS = (
+    "Check account balance",
+    "Ensure sufficient funds",
+    "Set up auto-debit if not already done"
+)
+PREMIUM_ACTIONS = (
+    "Review policy terms before renewal",
+    "Compare with other insurance providers",
+    "Update nominee information if needed"
+)
+
+def _parse_json_object(content: Optional[str]) -> Dict[str, Any]:
+    """Decode a JSON-mode reply; anything but a JSON object yields {}"""
+    try:
+        data = orjson.loads(content or "")
+    except orjson.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def _reminder_rank(reminder: DocumentReminder) -> tuple:
+    """Dashboard ordering: highest priority first, then the soonest reminder date"""
+    return (reminder.ai_priority_score or 0, -reminder.reminder_date.timestamp())
+
+def _prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+def _cache_put(cache: Dict[str, Any], key: str, value: Any) -> None:
+    if len(cache) >= AI_RESPONSE_CACHE_MAX_SIZE:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
 
 @dataclass
 class ReminderInsight:
@@ -36,8 +199,12 @@ class AIReminderService:
     
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        if self.openai_api_key and HAS_OPENAI:
-            openai.api_key = self.openai_api_key
+        # Async client so the AI calls gathered in create_intelligent_reminders overlap
+        self._openai_client = (
+            openai.AsyncOpenAI(api_key=self.openai_api_key) if self.openai_api_key and HAS_OPENAI else None
+        )
+        # Caps in-flight OpenAI requests across all documents so bursts queue here instead of hitting 429s
+        self._ai_semaphore = asyncio.Semaphore(int(os.getenv("OPENAI_CONCURRENCY", DEFAULT_OPENAI_CONCURRENCY)))
         
         # Reminder priority weights for different document types
         self.priority_weights = {
@@ -74,6 +241,12 @@ class AIReminderService:
             "festival_season": {"months": [10, 11, 12], "multiplier": 1.1},
             "travel_season": {"months": [4, 5, 6, 10, 11, 12], "multiplier": 1.2}
         }
+        # (month, document type) -> multipliers to apply, in seasonal_factors order
+        self._seasonal_multipliers = {}
+        for season, config in self.seasonal_factors.items():
+            for month in config["months"]:
+                for document_type in SEASON_DOCUMENT_TYPES.get(season, ()):
+                    self._seasonal_multipliers.setdefault((month, document_type), []).append(config["multiplier"])
 
     async def create_intelligent_reminders(
         self, 
@@ -91,30 +264,39 @@ class AIReminderService:
         # Get base reminder schedule
         base_schedule = self._get_base_reminder_schedule(document.document_type)
         
+        # One timestamp for every expiry comparison made while building this document's reminders
+        now = datetime.now()
+        
         # Apply AI insights to customize schedule
-        ai_insights = await self._analyze_document_context(document, user_context)
+        ai_insights = await self._analyze_document_context(document, user_context, now)
+        
+        # Only create future reminders
+        upcoming = [
+            (days_before, document.expiry_date - timedelta(days=days_before))
+            for days_before in base_schedule
+            if document.expiry_date - timedelta(days=days_before) > now
+        ]
+        
+        # Title/description generation is one AI call per reminder; run them, and the
+        # special reminders, concurrently instead of one round trip after another
+        expiry_text = document.expiry_date.strftime('%B %d, %Y')
+        *contents, special_reminders = await asyncio.gather(
+            *(self._generate_ai_content(document, days_before, ai_insights, expiry_text) for days_before, _ in upcoming),
+            self._create_special_reminders(document, ai_insights, now)
+        )
         
         # Create reminders with AI-enhanced scheduling
-        for days_before, reminder_config in base_schedule.items():
-            reminder_date = document.expiry_date - timedelta(days=days_before)
-            
-            # Only create future reminders
-            if reminder_date <= datetime.now():
-                continue
-            
+        reminder_ids = new_ids(len(upcoming))
+        actions = ai_insights.suggested_actions
+        for (days_before, reminder_date), (title, description), reminder_id in zip(upcoming, contents, reminder_ids):
             # Calculate AI priority score
             priority_score = self._calculate_ai_priority(
                 document, days_before, ai_insights, user_context
             )
             
-            # Generate AI-powered title and description
-            title, description = await self._generate_ai_content(
-                document, days_before, ai_insights
-            )
-            
             # Create reminder
             reminder = DocumentReminder(
-                id=str(uuid.uuid4()),
+                id=reminder_id,
                 user_id=document.user_id,
                 document_id=document.id,
                 title=title,
@@ -125,73 +307,41 @@ class AIReminderService:
                 advance_days=[days_before],
                 is_active=True,
                 ai_priority_score=priority_score,
-                ai_suggested_actions=ai_insights.suggested_actions,
-                created_at=datetime.now()
+                ai_suggested_actions=actions,
+                created_at=now
             )
             
             reminders.append(reminder)
         
         # Add special reminders (EMI, premium due, etc.)
-        special_reminders = await self._create_special_reminders(document, ai_insights)
         reminders.extend(special_reminders)
         
         return reminders
 
     def _get_base_reminder_schedule(self, document_type: DocumentType) -> Dict[int, Dict]:
         """Get base reminder schedule for document type."""
-        schedules = {
-            DocumentType.PAN_CARD: {
-                365: {"importance": "high", "type": "annual_check"},
-                180: {"importance": "medium", "type": "preparation"},
-                90: {"importance": "high", "type": "urgent"},
-                30: {"importance": "critical", "type": "immediate"},
-                7: {"importance": "critical", "type": "last_chance"}
-            },
-            DocumentType.PASSPORT: {
-                365: {"importance": "high", "type": "early_renewal"},
-                180: {"importance": "high", "type": "process_start"},
-                90: {"importance": "high", "type": "urgent"},
-                30: {"importance": "critical", "type": "emergency"},
-                15: {"importance": "critical", "type": "expedite"}
-            },
-            DocumentType.INSURANCE_POLICY: {
-                60: {"importance": "medium", "type": "review"},
-                30: {"importance": "high", "type": "renewal"},
-                15: {"importance": "high", "type": "payment_due"},
-                7: {"importance": "critical", "type": "urgent"},
-                3: {"importance": "critical", "type": "last_chance"}
-            },
-            DocumentType.DRIVING_LICENSE: {
-                90: {"importance": "medium", "type": "preparation"},
-                30: {"importance": "high", "type": "renewal"},
-                15: {"importance": "high", "type": "urgent"},
-                7: {"importance": "critical", "type": "immediate"}
-            }
-        }
-        
-        return schedules.get(document_type, {
-            30: {"importance": "medium", "type": "renewal"},
-            7: {"importance": "high", "type": "urgent"}
-        })
+        return REMINDER_SCHEDULES.get(document_type, DEFAULT_REMINDER_SCHEDULE)
 
     async def _analyze_document_context(
         self, 
         document: Document, 
-        user_context: Optional[Dict[str, Any]] = None
+        user_context: Optional[Dict[str, Any]] = None,
+        now: Optional[datetime] = None
     ) -> ReminderInsight:
         """Analyze document and user context to generate AI insights."""
+        now = now or datetime.now()
         
         # Base analysis without AI
         base_insight = ReminderInsight(
-            priority_score=self._calculate_base_priority(document),
-            urgency_level=self._determine_urgency_level(document),
+            priority_score=self._calculate_base_priority(document, now),
+            urgency_level=self._determine_urgency_level(document, now),
             suggested_actions=self._get_default_actions(document.document_type),
             estimated_cost=self._estimate_renewal_cost(document.document_type),
             related_reminders=[],
             ai_reasoning="Base analysis without AI enhancement"
         )
         
-        if not self.openai_api_key or not HAS_OPENAI:
+        if self._openai_client is None:
             return base_insight
         
         try:
@@ -204,7 +354,7 @@ class AIReminderService:
                 base_insight.ai_reasoning = ai_analysis.get("reasoning", base_insight.ai_reasoning)
             
         except Exception as e:
-            print(f"AI analysis failed: {str(e)}")
+            logger.warning("AI analysis failed for document %s: %s", document.id, e)
         
         return base_insight
 
@@ -215,67 +365,66 @@ class AIReminderService:
     ) -> Optional[Dict[str, Any]]:
         """Get AI-powered analysis of document renewal needs."""
         
-        prompt = f"""
-        Analyze the following document renewal scenario and provide intelligent insights:
-        
-        Document Details:
-        - Type: {document.document_type.value}
-        - Expiry Date: {document.expiry_date.strftime('%Y-%m-%d') if document.expiry_date else 'Not set'}
-        - Current Status: {document.status.value}
-        - Document Number: {document.document_number or 'Not available'}
-        
-        User Context: {user_context or 'No additional context'}
-        
-        Please provide:
-        1. Priority boost (0-3): How much to increase the base priority
-        2. Additional suggested actions (beyond standard renewal)
-        3. Reasoning for your recommendations
-        4. Any seasonal or timing considerations
-        
-        Respond in a structured format.
-        """
+        prompt = orjson.dumps({
+            "type": document.document_type.value,
+            "expiry": document.expiry_date.strftime('%Y-%m-%d') if document.expiry_date else None,
+            "status": document.status.value,
+            "num": document.document_number,
+            "ctx": user_context or None,
+        }, default=str).decode()
+        cache_key = _prompt_key(prompt)
+        if cache_key in _ai_analysis_cache:
+            return _ai_analysis_cache[cache_key]
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert document management advisor. Provide practical, actionable insights for document renewals considering Indian regulatory requirements and user convenience."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=300
-            )
+            async with self._ai_semaphore:
+                response = await self._openai_client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": ANALYSIS_SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.3,
+                    max_tokens=200,
+                    response_format={"type": "json_object"}
+                )
             
-            # Parse AI response (simplified parsing for demo)
-            content = response.choices[0].message.content
+            data = _parse_json_object(response.choices[0].message.content)
+            if not data:
+                return None
             
-            return {
-                "priority_boost": 1,  # Simplified for demo
-                "additional_actions": [
-                    "Check for required documents before starting process",
-                    "Consider online renewal options to save time"
-                ],
-                "reasoning": content[:200] + "..." if len(content) > 200 else content
+            try:
+                priority_boost = max(0, min(ANALYSIS_MAX_PRIORITY_BOOST, int(data.get("priority_boost", 0))))
+            except (TypeError, ValueError):
+                priority_boost = 0
+            actions = data.get("additional_actions")
+            analysis = {
+                "priority_boost": priority_boost,
+                "additional_actions": [a for a in actions if isinstance(a, str) and a] if isinstance(actions, list) else [],
+                "reasoning": str(data.get("reasoning") or "")[:200] or "AI analysis without reasoning"
             }
+            _cache_put(_ai_analysis_cache, cache_key, analysis)
+            return analysis
             
         except Exception as e:
-            print(f"OpenAI API error: {str(e)}")
+            logger.warning("OpenAI analysis request failed: %s", e)
             return None
 
-    def _calculate_base_priority(self, document: Document) -> int:
+    def _calculate_base_priority(self, document: Document, now: Optional[datetime] = None) -> int:
         """Calculate base priority score for a document."""
+        now = now or datetime.now()
         config = self.priority_weights.get(document.document_type, {"base_priority": 5})
         base_priority = config["base_priority"]
         
         # Adjust based on expiry proximity
         if document.expiry_date:
-            days_to_expiry = (document.expiry_date - datetime.now()).days
+            days_to_expiry = (document.expiry_date - now).days
             
             if days_to_expiry < 0:
                 return 10  # Expired - maximum priority
@@ -285,22 +434,17 @@ class AIReminderService:
                 return min(10, base_priority + 1)
         
         # Apply seasonal factors
-        current_month = datetime.now().month
-        for season, config in self.seasonal_factors.items():
-            if current_month in config["months"]:
-                if document.document_type in [DocumentType.PAN_CARD, DocumentType.ITR] and season == "tax_season":
-                    base_priority = min(10, int(base_priority * config["multiplier"]))
-                elif document.document_type == DocumentType.PASSPORT and season == "travel_season":
-                    base_priority = min(10, int(base_priority * config["multiplier"]))
+        for multiplier in self._seasonal_multipliers.get((now.month, document.document_type), ()):
+            base_priority = min(10, int(base_priority * multiplier))
         
         return base_priority
 
-    def _determine_urgency_level(self, document: Document) -> str:
+    def _determine_urgency_level(self, document: Document, now: Optional[datetime] = None) -> str:
         """Determine urgency level based on document and expiry."""
         if not document.expiry_date:
             return "low"
         
-        days_to_expiry = (document.expiry_date - datetime.now()).days
+        days_to_expiry = (document.expiry_date - (now or datetime.now())).days
         
         if days_to_expiry < 0:
             return "critical"
@@ -315,64 +459,31 @@ class AIReminderService:
 
     def _get_default_actions(self, document_type: DocumentType) -> List[str]:
         """Get default actions for document type."""
-        action_map = {
-            DocumentType.PAN_CARD: [
-                "Visit NSDL or UTIITSL website",
-                "Keep Aadhaar card ready",
-                "Prepare passport size photo"
-            ],
-            DocumentType.PASSPORT: [
-                "Book appointment on Passport Seva website",
-                "Gather required documents",
-                "Pay applicable fees online"
-            ],
-            DocumentType.DRIVING_LICENSE: [
-                "Visit RTO website for online renewal",
-                "Prepare medical certificate if required",
-                "Keep existing license ready"
-            ],
-            DocumentType.INSURANCE_POLICY: [
-                "Review current coverage",
-                "Compare renewal with other providers",
-                "Set up automatic payment if needed"
-            ]
-        }
-        
-        return action_map.get(document_type, ["Start renewal process"])
+        # Fresh list: callers extend it with AI-suggested actions
+        return list(DEFAULT_ACTIONS.get(document_type, ("Start renewal process",)))
 
     def _estimate_renewal_cost(self, document_type: DocumentType) -> Optional[float]:
         """Estimate renewal cost for document type (in INR)."""
-        cost_estimates = {
-            DocumentType.PAN_CARD: 110.0,  # Re-issue fee
-            DocumentType.PASSPORT: 1500.0,  # Normal processing
-            DocumentType.DRIVING_LICENSE: 200.0,  # Renewal fee
-            DocumentType.INSURANCE_POLICY: None,  # Varies too much
-            DocumentType.LOAN_AGREEMENT: None  # Not applicable
-        }
-        
-        return cost_estimates.get(document_type)
+        return RENEWAL_COST_ESTIMATES.get(document_type)
 
     async def _create_special_reminders(
         self, 
         document: Document, 
-        insights: ReminderInsight
+        insights: ReminderInsight,
+        now: Optional[datetime] = None
     ) -> List[DocumentReminder]:
         """Create special reminders like EMI due, premium payments, etc."""
         special_reminders = []
+        now = now or datetime.now()
         
         if document.document_type == DocumentType.LOAN_AGREEMENT:
             # Create EMI reminders (assuming monthly)
-            emi_reminders = await self._create_emi_reminders(document, insights)
+            emi_reminders = await self._create_emi_reminders(document, insights, now)
             special_reminders.extend(emi_reminders)
         
-        elif document.document_type in [
-            DocumentType.INSURANCE_POLICY, 
-            DocumentType.HEALTH_INSURANCE,
-            DocumentType.LIFE_INSURANCE,
-            DocumentType.VEHICLE_INSURANCE
-        ]:
+        elif document.document_type in INSURANCE_DOCUMENT_TYPES:
             # Create premium payment reminders
-            premium_reminders = await self._create_premium_reminders(document, insights)
+            premium_reminders = await self._create_premium_reminders(document, insights, now)
             special_reminders.extend(premium_reminders)
         
         return special_reminders
@@ -380,10 +491,12 @@ class AIReminderService:
     async def _create_emi_reminders(
         self, 
         document: Document, 
-        insights: ReminderInsight
+        insights: ReminderInsight,
+        now: Optional[datetime] = None
     ) -> List[DocumentReminder]:
         """Create EMI payment reminders."""
         reminders = []
+        now = now or datetime.now()
         
         # Extract EMI date from document data (if available)
         emi_day = self._extract_emi_day(document)
@@ -391,38 +504,40 @@ class AIReminderService:
             emi_day = 5  # Default to 5th of each month
         
         # Create next 6 months of EMI reminders
-        current_date = datetime.now().replace(day=1)  # Start from beginning of current month
+        # Enough ids for every candidate; the unused few are just discarded
+        reminder_ids = iter(new_ids(EMI_REMINDER_MONTHS * len(EMI_REMINDER_DAYS_BEFORE)))
+        
+        actions = list(EMI_ACTIONS)
         
-        for month_offset in range(6):
-            emi_date = current_date + timedelta(days=32 * month_offset)  # Approximate month
-            emi_date = emi_date.replace(day=emi_day)
+        for month_offset in range(EMI_REMINDER_MONTHS):
+            # Exact calendar month; a due day past the month's end falls on its last day
+            year_offset, month_index = divmod(now.month - 1 + month_offset, 12)
+            year, month = now.year + year_offset, month_index + 1
+            emi_date = now.replace(year=year, month=month, day=min(emi_day, calendar.monthrange(year, month)[1]))
+            description = f"Your loan EMI payment is due on {emi_date.strftime('%B %d, %Y')}"
             
             # Skip if date is in the past
-            if emi_date <= datetime.now():
+            if emi_date <= now:
                 continue
             
             # Create reminders 3 days and 1 day before EMI
-            for days_before in [3, 1]:
+            for days_before in EMI_REMINDER_DAYS_BEFORE:
                 reminder_date = emi_date - timedelta(days=days_before)
                 
-                if reminder_date > datetime.now():
+                if reminder_date > now:
                     reminder = DocumentReminder(
-                        id=str(uuid.uuid4()),
+                        id=next(reminder_ids),
                         user_id=document.user_id,
                         document_id=document.id,
                         title=f"EMI Payment Due in {days_before} day{'s' if days_before > 1 else ''}",
-                        description=f"Your loan EMI payment is due on {emi_date.strftime('%B %d, %Y')}",
+                        description=description,
                         reminder_type=ReminderType.EMI_DUE,
                         reminder_date=reminder_date,
                         frequency=ReminderFrequency.MONTHLY,
                         is_active=True,
                         ai_priority_score=9,  # EMI is high priority
-                        ai_suggested_actions=[
-                            "Check account balance",
-                            "Ensure sufficient funds",
-                            "Set up auto-debit if not already done"
-                        ],
-                        created_at=datetime.now()
+                        ai_suggested_actions=actions,
+                        created_at=now
                     )
                     reminders.append(reminder)
         
@@ -431,10 +546,12 @@ class AIReminderService:
     async def _create_premium_reminders(
         self, 
         document: Document, 
-        insights: ReminderInsight
+        insights: ReminderInsight,
+        now: Optional[datetime] = None
     ) -> List[DocumentReminder]:
         """Create insurance premium payment reminders."""
         reminders = []
+        now = now or datetime.now()
         
         if not document.expiry_date:
             return reminders
@@ -443,27 +560,26 @@ class AIReminderService:
         premium_due_date = document.expiry_date
         
         # Create reminders before premium due
-        for days_before in [45, 30, 15, 7, 1]:
+        reminder_ids = iter(new_ids(len(PREMIUM_REMINDER_DAYS_BEFORE)))
+        actions = insights.suggested_actions + list(PREMIUM_ACTIONS)
+        description = f"Your {document.document_type.value} premium payment is due on {premium_due_date.strftime('%B %d, %Y')}"
+        for days_before in PREMIUM_REMINDER_DAYS_BEFORE:
             reminder_date = premium_due_date - timedelta(days=days_before)
             
-            if reminder_date > datetime.now():
+            if reminder_date > now:
                 reminder = DocumentReminder(
-                    id=str(uuid.uuid4()),
+                    id=next(reminder_ids),
                     user_id=document.user_id,
                     document_id=document.id,
                     title=f"Insurance Premium Due in {days_before} days",
-                    description=f"Your {document.document_type.value} premium payment is due on {premium_due_date.strftime('%B %d, %Y')}",
+                    description=description,
                     reminder_type=ReminderType.PREMIUM_DUE,
                     reminder_date=reminder_date,
                     frequency=ReminderFrequency.YEARLY,
                     is_active=True,
                     ai_priority_score=8,
-                    ai_suggested_actions=insights.suggested_actions + [
-                        "Review policy terms before renewal",
-                        "Compare with other insurance providers",
-                        "Update nominee information if needed"
-                    ],
-                    created_at=datetime.now()
+                    ai_suggested_actions=actions,
+                    created_at=now
                 )
                 reminders.append(reminder)
         
@@ -486,58 +602,56 @@ class AIReminderService:
         self, 
         document: Document, 
         days_before: int, 
-        insights: ReminderInsight
+        insights: ReminderInsight,
+        expiry_text: Optional[str] = None
     ) -> tuple[str, str]:
         """Generate AI-powered title and description for reminders."""
         
         # Fallback content
-        doc_type_name = document.document_type.value.replace('_', ' ').title()
+        doc_type_name = DOCUMENT_TYPE_NAMES[document.document_type]
+        if expiry_text is None:
+            expiry_text = document.expiry_date.strftime('%B %d, %Y') if document.expiry_date else 'unknown date'
         default_title = f"{doc_type_name} expires in {days_before} days"
-        default_description = f"Your {doc_type_name} will expire on {document.expiry_date.strftime('%B %d, %Y') if document.expiry_date else 'unknown date'}. Please start the renewal process."
+        default_description = f"Your {doc_type_name} will expire on {expiry_text}. Please start the renewal process."
         
-        if not self.openai_api_key or not HAS_OPENAI:
+        if self._openai_client is None:
             return default_title, default_description
         
         try:
-            prompt = f"""
-            Create a concise, actionable reminder for:
-            Document: {doc_type_name}
-            Days until expiry: {days_before}
-            Urgency: {insights.urgency_level}
+            prompt = orjson.dumps(
+                {"doc": doc_type_name, "days": days_before, "urgency": insights.urgency_level}
+            ).decode()
+            cache_key = _prompt_key(prompt)
+            if cache_key in _ai_content_cache:
+                return _ai_content_cache[cache_key]
             
-            Generate:
-            1. A brief, clear title (max 60 characters)
-            2. A helpful description with next steps (max 150 characters)
-            
-            Make it user-friendly and action-oriented.
-            """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "Generate clear, concise reminder messages that motivate users to take action."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.2,
-                max_tokens=100
-            )
-            
-            content = response.choices[0].message.content.strip()
-            lines = content.split('\n')
+            async with self._ai_semaphore:
+                response = await self._openai_client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {
+                            "role": "system", 
+                            "content": CONTENT_SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user", 
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.2,
+                    max_tokens=80,
+                    response_format={"type": "json_object"}
+                )
             
-            if len(lines) >= 2:
-                title = lines[0].replace('1.', '').strip()[:60]
-                description = lines[1].replace('2.', '').strip()[:150]
+            data = _parse_json_object(response.choices[0].message.content)
+            title = str(data.get("title") or "").strip()[:60]
+            description = str(data.get("description") or "").strip()[:150]
+            if title and description:
+                _cache_put(_ai_content_cache, cache_key, (title, description))
                 return title, description
             
         except Exception as e:
-            print(f"AI content generation failed: {str(e)}")
+            logger.warning("AI content generation failed for document %s: %s", document.id, e)
         
         return default_title, default_description
 
@@ -578,31 +692,33 @@ class AIReminderService:
         """Generate intelligent reminder dashboard with AI insights."""
         
         now = datetime.now()
-        
-        # Categorize reminders
-        urgent_reminders = [
-            r for r in user_reminders 
-            if r.is_active and not r.is_completed and r.reminder_date <= now + timedelta(days=7)
-        ]
-        
-        upcoming_reminders = [
-            r for r in user_reminders 
-            if r.is_active and not r.is_completed and now + timedelta(days=7) < r.reminder_date <= now + timedelta(days=30)
-        ]
+        week_ahead = now + timedelta(days=7)
+        month_ahead = now + timedelta(days=30)
+        
+        # Categorize reminders in one pass
+        urgent_reminders = []
+        upcoming_reminders = []
+        for r in user_reminders:
+            if not r.is_active or r.is_completed:
+                continue
+            if r.reminder_date <= week_ahead:
+                urgent_reminders.append(r)
+            elif r.reminder_date <= month_ahead:
+                upcoming_reminders.append(r)
         
         # Identify documents needing attention
-        expired_docs = [
-            doc for doc in user_documents 
-            if doc.expiry_date and doc.expiry_date < now
-        ]
-        
-        expiring_soon = [
-            doc for doc in user_documents 
-            if doc.expiry_date and now < doc.expiry_date <= now + timedelta(days=30)
-        ]
+        expired_docs = []
+        expiring_soon = []
+        for doc in user_documents:
+            if not doc.expiry_date:
+                continue
+            if doc.expiry_date < now:
+                expired_docs.append(doc)
+            elif now < doc.expiry_date <= month_ahead:
+                expiring_soon.append(doc)
         
         # Generate AI insights
-        ai_insights = await self._generate_dashboard_insights(
+        ai_insights = self._generate_dashboard_insights(
             urgent_reminders, upcoming_reminders, expired_docs, expiring_soon
         )
         
@@ -613,22 +729,28 @@ class AIReminderService:
                 "expired_documents": len(expired_docs),
                 "expiring_soon": len(expiring_soon)
             },
-            "urgent_reminders": [self._format_reminder(r) for r in urgent_reminders[:5]],
-            "upcoming_reminders": [self._format_reminder(r) for r in upcoming_reminders[:10]],
-            "expired_documents": [self._format_document_alert(doc, "expired") for doc in expired_docs],
-            "expiring_soon": [self._format_document_alert(doc, "expiring") for doc in expiring_soon],
+            "urgent_reminders": [
+                self._format_reminder(r)
+                for r in heapq.nlargest(DASHBOARD_URGENT_LIMIT, urgent_reminders, key=_reminder_rank)
+            ],
+            "upcoming_reminders": [
+                self._format_reminder(r)
+                for r in heapq.nlargest(DASHBOARD_UPCOMING_LIMIT, upcoming_reminders, key=_reminder_rank)
+            ],
+            "expired_documents": [self._format_document_alert(doc, "expired", now) for doc in expired_docs],
+            "expiring_soon": [self._format_document_alert(doc, "expiring", now) for doc in expiring_soon],
             "ai_insights": ai_insights,
             "recommended_actions": self._get_recommended_actions(urgent_reminders, expired_docs)
         }
 
-    async def _generate_dashboard_insights(
+    def _generate_dashboard_insights(
         self,
         urgent_reminders: List[DocumentReminder],
         upcoming_reminders: List[DocumentReminder],
         expired_docs: List[Document],
         expiring_soon: List[Document]
     ) -> Dict[str, Any]:
-        """Generate AI insights for the reminder dashboard."""
+        """Rule-based dashboard health summary; plain counts only, so no I/O and no await."""
         
         total_issues = len(urgent_reminders) + len(expired_docs)
         
@@ -669,7 +791,9 @@ class AIReminderService:
             "suggested_actions": reminder.ai_suggested_actions[:3]  # Top 3 actions
         }
 
-    def _format_document_alert(self, document: Document, alert_type: str) -> Dict[str, Any]:
+    def _format_document_alert(
+        self, document: Document, alert_type: str, now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """Format document alert for display."""
         return {
             "document_id": document.id,
@@ -677,7 +801,7 @@ class AIReminderService:
             "document_type": document.document_type.value,
             "alert_type": alert_type,
             "expiry_date": document.expiry_date.isoformat() if document.expiry_date else None,
-            "days_until_expiry": (document.expiry_date - datetime.now()).days if document.expiry_date else None
+            "days_until_expiry": (document.expiry_date - (now or datetime.now())).days if document.expiry_date else None
         }
 
     def _get_recommended_actions(
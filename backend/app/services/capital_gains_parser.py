@@ -1,8 +1,10 @@
 import pandas as pd
-from io import BytesIO, StringIO
-from typing import List
+from io import BytesIO
+from typing import BinaryIO, List, Union
 
 class CapitalGain:
+    __slots__ = ('trade_date', 'type', 'instrument', 'quantity', 'buy_price', 'sell_price', 'gain_loss', 'holding_period')
+
     def __init__(self, trade_date, type, instrument, quantity, buy_price, sell_price, gain_loss, holding_period):
         self.trade_date = trade_date
         self.type = type
@@ -13,6 +15,9 @@ class CapitalGain:
         self.gain_loss = gain_loss
         self.holding_period = holding_period
 
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
 class CapitalGainsParser:
     """
     Dedicated parser for capital gains CSVs from brokers (Zerodha, Groww, Upstox) and tax platforms (Taxwise, ClearTax, etc.)
@@ -38,12 +43,14 @@ class CapitalGainsParser:
                 return source
         return 'unknown'
 
-    def ingest_gains(self, file_content: bytes, filename: str) -> List[CapitalGain]:
+    def ingest_gains(self, file_content: Union[bytes, BinaryIO], filename: str) -> List[CapitalGain]:
         ext = filename.split('.')[-1].lower()
+        # Raw bytes are wrapped; a spooled upload handle is read in place, without a bytes copy
+        stream = BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
         if ext == 'csv':
-            df = pd.read_csv(StringIO(file_content.decode('utf-8')))
+            df = pd.read_csv(stream, encoding='utf-8')
         else:
-            df = pd.read_excel(BytesIO(file_content))
+            df = pd.read_excel(stream)
         df.columns = [c.strip().lower().replace(' ', '_') for c in df.columns]
         gains = []
         for _, row in df.iterrows():
@@ -1,12 +1,12 @@
 from app.services.capital_gains_parser import CapitalGainsParser, CapitalGain
-from typing import List
+from typing import BinaryIO, List, Union
 
 class CapitalGainsService:
     def __init__(self):
         self.parser = CapitalGainsParser()
         self.gains_db = {}  # In-memory user_id -> List[CapitalGain]
 
-    def ingest(self, user_id: str, file_content: bytes, filename: str):
+    def ingest(self, user_id: str, file_content: Union[bytes, BinaryIO], filename: str):
         gains = self.parser.ingest_gains(file_content, filename)
         self.gains_db[user_id] = gains
         return gains
@@ -1,25 +1,70 @@
-import os
-from dotenv import load_dotenv
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
+import hashlib
+from functools import lru_cache
+from typing import AsyncIterator
+from app.core.config import get_settings
+GEMINI_API_KEY = get_settings().GOOGLE_API_KEY
 
-import google.generativeai as genai
+# Successful replies keyed by SHA-256(question); oldest entries are evicted first
+RESPONSE_CACHE_MAX_SIZE = 512
+_response_cache = {}
 
-# Configure API key (from .env)
-genai.configure(api_key=GEMINI_API_KEY)
+@lru_cache(maxsize=1)
+def _get_model():
+    # google.generativeai is slow to import; load and configure it on first chat
+    import google.generativeai as genai
 
-def ask_gemini(question: str) -> str:
-    try:
-        model = genai.GenerativeModel(
-            "gemini-2.0-flash",
-            system_instruction=(
-                "You are TaxWise Assistant 🤖. "
-                "Always reply in concise bullet points using markdown formatting. "
-                "Only answer questions about Indian taxes, CIBIL scores, and personal finance. "
-                "Keep answers short and clear. Use lists, headings, and bold for important info."
-            )
+    # Configure API key (from .env)
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(
+        "gemini-2.0-flash",
+        system_instruction=(
+            "You are TaxWise Assistant 🤖. "
+            "Always reply in concise bullet points using markdown formatting. "
+            "Only answer questions about Indian taxes, CIBIL scores, and personal finance. "
+            "Keep answers short and clear. Use lists, headings, and bold for important info."
         )
-        response = model.generate_content(question)
-        return response.text if response else "Sorry, I couldn't generate a response."
+    )
+
+async def ask_gemini(question: str) -> str:
+    key = hashlib.sha256(question.encode()).hexdigest()
+    cached = _response_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        model = _get_model()
+        # Async client call so a slow Gemini round-trip doesn't block the event loop
+        response = await model.generate_content_async(question)
+        if not response:
+            return "Sorry, I couldn't generate a response."
+        reply = response.text
+    except Exception as e:
+        return f"Error: {str(e)}"
+    if len(_response_cache) >= RESPONSE_CACHE_MAX_SIZE:
+        del _response_cache[next(iter(_response_cache))]
+    _response_cache[key] = reply
+    return reply
+
+async def stream_gemini(question: str) -> AsyncIterator[str]:
+    """Yield the reply as Gemini produces it; cached replies are sent in one piece"""
+    key = hashlib.sha256(question.encode()).hexdigest()
+    cached = _response_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+    parts = []
+    try:
+        model = _get_model()
+        response = await model.generate_content_async(question, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                parts.append(chunk.text)
+                yield chunk.text
     except Exception as e:
-        return f"Error: {str(e)}"
\ No newline at end of file
+        yield f"Error: {str(e)}"
+        return
+    if not parts:
+        yield "Sorry, I couldn't generate a response."
+        return
+    if len(_response_cache) >= RESPONSE_CACHE_MAX_SIZE:
+        del _response_cache[next(iter(_response_cache))]
+    _response_cache[key] = "".join(parts)
@@ -1,3 +1,4 @@
+import bisect
 from typing import Dict, List, Optional, Tuple
 from app.models.database import CIBILData, CIBILRecommendation, Transaction, TransactionCategory
 from datetime import datetime, timedelta
@@ -15,6 +16,10 @@ class CIBILAdvisor:
             "Poor": (550, 649),
             "Bad": (300, 549)
         }
+        # Ranges ordered by lower bound, for bisect lookups in get_score_category()
+        ordered_ranges = sorted(self.score_ranges.items(), key=lambda item: item[1][0])
+        self._range_floors = [min_score for _, (min_score, _) in ordered_ranges]
+        self._range_bands = [(category, max_score) for category, (_, max_score) in ordered_ranges]
         
         # Component Weights (as per CIBIL methodology)
         self.weights = {
@@ -301,10 +306,11 @@ class CIBILAdvisor:
     
     def get_score_category(self, score: int) -> str:
         """Get score category description"""
-        for category, (min_score, max_score) in self.score_ranges.items():
-            if min_score <= score <= max_score:
-                return category
-        return "Unknown"
+        index = bisect.bisect_right(self._range_floors, score) - 1
+        if index < 0:
+            return "Unknown"
+        category, max_score = self._range_bands[index]
+        return category if score <= max_score else "Unknown"
     
     def calculate_loan_eligibility(self, cibil_data: CIBILData, 
                                   monthly_income: float) -> Dict:
@@ -44,7 +44,7 @@ class DebtService:
         timeline = []
         total_interest = 0
         month = 0
-        debts_copy = [Debt(**vars(d)) for d in debts]
+        debts_copy = [Debt(**d.to_dict()) for d in debts]
         # Repayment logic: pay minimum EMI to all, extra goes to target debt
         while any(d.principal > 0 for d in debts_copy):
             month += 1
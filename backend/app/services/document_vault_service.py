@@ -1,6 +1,7 @@
 import os
 import uuid
 import hashlib
+import logging
 import mimetypes
 from typing import List, Optional, Dict, Any, BinaryIO
 from datetime import datetime, timedelta
@@ -19,6 +20,8 @@ from app.models.database import (
 )
 from app.services.ai_document_processor import AIDocumentProcessor
 
+logger = logging.getLogger(__name__)
+
 
 class DocumentVaultService:
     """
@@ -199,7 +202,7 @@ class DocumentVaultService:
                 if not document.issue_date and "issue_date" in extraction.get("structured_data", {}):
                     document.issue_date = extraction["structured_data"]["issue_date"]
         except Exception as e:
-            print(f"AI processing failed for document {document_id}: {str(e)}")
+            logger.warning("AI processing failed for document %s: %s", document_id, e)
             # Continue without AI processing
         
         # Create automatic reminders based on document type and expiry
@@ -327,7 +330,7 @@ class DocumentVaultService:
             timestamp=datetime.now()
         )
         # In production, save to database
-        print(f"Audit log: {action} on document {document_id} by user {user_id}")
+        logger.info("Audit log: %s on document %s by user %s", action, document_id, user_id)
 
     async def get_storage_stats(self, user_id: str) -> Dict[str, Any]:
         """Get storage statistics for a user."""
@@ -341,8 +344,14 @@ class DocumentVaultService:
                 "by_type": {}
             }
         
-        total_size = sum(f.stat().st_size for f in user_path.glob("*.enc"))
-        file_count = len(list(user_path.glob("*.enc")))
+        # One directory pass; DirEntry reuses the stat data from the scan where the OS provides it
+        total_size = 0
+        file_count = 0
+        with os.scandir(user_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".enc") and entry.is_file():
+                    total_size += entry.stat().st_size
+                    file_count += 1
         
         return {
             "total_documents": file_count,
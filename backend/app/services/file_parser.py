@@ -1,13 +1,32 @@
+import logging
 import pandas as pd
-import pdfplumber
-import pytesseract
-from PIL import Image
 import re
 from io import BytesIO
 from datetime import datetime
 from app.models.database import Transaction, TransactionCategory
 import numpy as np
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional, Union
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+RECURRING_RE = re.compile(
+    r"emi|sip|rent|salary|insurance|premium|subscription|monthly|recurring", re.IGNORECASE
+)
+
+# TransactionCategory values in definition order; analysis frames store categories as codes into this
+CATEGORY_NAMES = tuple(category.value for category in TransactionCategory)
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORY_NAMES)}
+
+TAG_REGEXES = {
+    tag: re.compile(tag, re.IGNORECASE)
+    for tag in ('swiggy', 'zomato', 'uber', 'ola', 'amazon', 'flipkart', 'netflix')
+}
 
 # Import the new CapitalGainsParser
 from app.services.capital_gains_parser import CapitalGainsParser
@@ -226,6 +245,11 @@ class FileParser:
                 r"course", r"training", r"books"
             ]
         }
+        # One compiled alternation per category, checked in the same order as self.patterns
+        self.category_regexes = {
+            category: re.compile("|".join(patterns), re.IGNORECASE)
+            for category, patterns in self.patterns.items()
+        }
         
         # Enhanced date patterns for Indian banks
         self.date_patterns = [
@@ -245,58 +269,70 @@ class FileParser:
         ]
         self.last_pdf_analysis = {}
     
-    def parse_csv(self, file_content: bytes, filename: str) -> List[Transaction]:
+    def parse_csv(self, file_content: Union[bytes, BinaryIO], filename: str) -> List[Transaction]:
         """Parse CSV file containing transaction data"""
         try:
             # Try to read CSV with different encodings
             for encoding in ['utf-8', 'iso-8859-1', 'cp1252']:
                 try:
-                    df = pd.read_csv(BytesIO(file_content), encoding=encoding)
+                    df = self._read_csv(file_content, encoding=encoding)
                     break
                 except UnicodeDecodeError:
                     continue
             else:
-                df = pd.read_csv(BytesIO(file_content), encoding='utf-8', errors='ignore')
+                df = self._read_csv(file_content, encoding='utf-8', encoding_errors='ignore')
             
             # Clean and normalize column names
             df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
-            print(f"CSV columns after normalization: {list(df.columns)}")
-            print(f"CSV shape: {df.shape}")
-            print(f"First few rows:\n{df.head()}")
+            logger.debug("CSV columns after normalization: %s, shape: %s", list(df.columns), df.shape)
             
             # Identify columns
             date_cols = self._find_date_column(df)
             amount_cols = self._find_amount_columns(df)
             desc_cols = self._find_description_columns(df)
             
-            print(f"Detected date columns: {date_cols}")
-            print(f"Detected amount columns: {amount_cols}")
-            print(f"Detected description columns: {desc_cols}")
+            logger.debug("Detected date columns: %s, amount columns: %s, description columns: %s",
+                         date_cols, amount_cols, desc_cols)
             
             if not date_cols or not amount_cols or not desc_cols:
                 raise ValueError("Could not identify required columns in CSV")
             
             # Process transactions
-            transactions = []
-            for _, row in df.iterrows():
-                transaction = self._process_transaction_row(
-                    row, date_cols[0], amount_cols[0], desc_cols[0]
-                )
-                if transaction:
-                    transactions.append(transaction)
-            
-            return transactions
+            return self._rows_to_transactions(df, date_cols[0], amount_cols[0], desc_cols[0])
             
         except Exception as e:
             raise ValueError(f"Error parsing CSV file: {str(e)}")
     
-    def parse_pdf(self, file_content: bytes, filename: str) -> List[Transaction]:
+    @staticmethod
+    def _as_stream(file_content: Union[bytes, BinaryIO]) -> BinaryIO:
+        """Wrap raw bytes, or rewind an already-spooled upload, so it can be read from the start"""
+        if isinstance(file_content, (bytes, bytearray)):
+            return BytesIO(file_content)
+        file_content.seek(0)
+        return file_content
+
+    def _read_csv(self, file_content: Union[bytes, BinaryIO], **kwargs) -> pd.DataFrame:
+        """Read CSV content with the multithreaded pyarrow parser when available"""
+        if HAS_PYARROW and 'encoding_errors' not in kwargs:
+            try:
+                return pd.read_csv(self._as_stream(file_content), engine='pyarrow', **kwargs)
+            except UnicodeDecodeError:
+                raise
+            except Exception:
+                # pyarrow is stricter about ragged rows/quoting; let the C parser have a go
+                pass
+        return pd.read_csv(self._as_stream(file_content), **kwargs)
+
+    def parse_pdf(self, file_content: Union[bytes, BinaryIO], filename: str) -> List[Transaction]:
         """
         Parse PDF bank statement using both table and improved text extraction.
         Falls back to OCR if no text is found.
         """
+        # PDF/OCR stacks are only needed here; keep them off the import path
+        import pdfplumber
+        import pytesseract
         transactions = []
-        with pdfplumber.open(BytesIO(file_content)) as pdf:
+        with pdfplumber.open(self._as_stream(file_content)) as pdf:
             for page_num, page in enumerate(pdf.pages):
                 # 1. Try table extraction
                 tables = page.extract_tables()
@@ -645,7 +681,6 @@ class FileParser:
         for col in df.columns:
             if any(keyword in col.lower() for keyword in ['amount', 'balance', 'debit', 'credit', 'withdrawal', 'deposit']):
                 amount_cols.append(col)
-                print(f"Added amount column: {col}")
         
         return amount_cols
 
@@ -656,10 +691,19 @@ class FileParser:
         for col in df.columns:
             if any(keyword in col.lower() for keyword in ['description', 'particular', 'detail', 'narration', 'remark']):
                 desc_cols.append(col)
-                print(f"Added description column: {col}")
         
         return desc_cols
 
+    def _rows_to_transactions(self, df, date_col, amount_col, desc_col) -> List[Transaction]:
+        """Build transactions from plain dicts of just the used columns (iterrows() builds a Series per row)"""
+        used_cols = list(dict.fromkeys((date_col, amount_col, desc_col)))
+        transactions = []
+        for row in df[used_cols].to_dict('records'):
+            transaction = self._process_transaction_row(row, date_col, amount_col, desc_col)
+            if transaction:
+                transactions.append(transaction)
+        return transactions
+
     def _process_transaction_row(self, row, date_col, amount_col, desc_col):
         """Process a single transaction row"""
         try:
@@ -672,8 +716,6 @@ class FileParser:
             # Get description
             description = str(row[desc_col])
             
-            print(f"Processing transaction: date={date_obj}, amount={amount}, desc={description[:30]}...")
-            
             # Create transaction
             transaction = Transaction(
                 id=None,
@@ -688,73 +730,59 @@ class FileParser:
             
             return transaction
         except Exception as e:
-            print(f"Error processing transaction row: {e}")
+            logger.debug("Skipping unparseable transaction row: %s", e)
             return None
 
     def _categorize_transaction(self, description: str, amount: float) -> str:
         """Categorize transaction based on description and amount"""
-        desc_lower = description.lower()
-        
         # Check if it's income (positive amount or specific keywords)
-        if amount > 0 or any(re.search(pattern, desc_lower, re.IGNORECASE) for pattern in self.patterns["income"]):
+        if amount > 0 or self.category_regexes["income"].search(description):
             return "income"
         
         # Check other categories
-        for category, patterns in self.patterns.items():
-            if category != "income":
-                for pattern in patterns:
-                    if re.search(pattern, desc_lower, re.IGNORECASE):
-                        return category
+        for category, regex in self.category_regexes.items():
+            if category != "income" and regex.search(description):
+                return category
         
         # Default category for expenses
         return "expense"
 
     def _is_recurring_transaction(self, description: str) -> bool:
         """Check if transaction is likely recurring"""
-        recurring_patterns = [
-            r"emi", r"sip", r"rent", r"salary", r"insurance", r"premium", 
-            r"subscription", r"monthly", r"recurring"
-        ]
-        
-        desc_lower = description.lower()
-        return any(re.search(pattern, desc_lower, re.IGNORECASE) for pattern in recurring_patterns)
+        return RECURRING_RE.search(description) is not None
 
     def _extract_tags(self, description: str) -> List[str]:
         """Extract tags from transaction description"""
-        tags = []
-        desc_lower = description.lower()
-        
         # Common service/brand tags
-        tag_patterns = {
-            'swiggy': r'swiggy',
-            'zomato': r'zomato',
-            'uber': r'uber',
-            'ola': r'ola',
-            'amazon': r'amazon',
-            'flipkart': r'flipkart',
-            'netflix': r'netflix'
-        }
-        
-        for tag, pattern in tag_patterns.items():
-            if re.search(pattern, desc_lower, re.IGNORECASE):
-                tags.append(tag)
-        
-        return tags
+        return [tag for tag, regex in TAG_REGEXES.items() if regex.search(description)]
 
     def analyze_transactions(self, transactions: List[Transaction]) -> Dict:
         """Analyze transaction patterns and provide insights"""
         import math
         if not transactions:
             return {}
-        df = pd.DataFrame([t.dict() for t in transactions])
+        # Build the frame column-wise from attributes; avoids a model-to-dict round trip per row
+        # category becomes a Categorical over int codes rather than an object column of strings
+        category_codes = np.fromiter(
+            (CATEGORY_CODES[t.category] for t in transactions), dtype=np.int8, count=len(transactions)
+        )
+        df = pd.DataFrame({
+            field: pd.Categorical.from_codes(category_codes, categories=CATEGORY_NAMES) if field == 'category'
+            else [getattr(t, field) for t in transactions]
+            for field in Transaction.model_fields
+        })
         def safe(val):
             if isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
                 return 0
             return val
 
-        # Explicit pattern breakdowns
+        # Explicit pattern breakdowns; one grouping pass serves every pattern lookup
+        category_groups = df.groupby('category', sort=False, observed=True)
+
         def pattern_df(pattern):
-            return df[df['category'] == pattern]
+            if pattern not in category_groups.groups:
+                return df.iloc[0:0]
+            return category_groups.get_group(pattern)
 
         def pattern_summary(pattern):
             pdf = pattern_df(pattern)
@@ -765,6 +793,13 @@ class FileParser:
                 "transactions": pdf.to_dict(orient='records')
             }
 
+        # Split income/expense once instead of re-masking for every statistic
+        is_income = df['category'] == 'income'
+        income_amounts = df.loc[is_income, 'amount']
+        expense_amounts = df.loc[~is_income, 'amount']
+        category_stats = category_groups['amount'].agg(['sum', 'count', 'mean'])
+        recurring_amounts = df.loc[df['is_recurring'].astype(bool), 'amount']
+
         analysis = {
             "total_transactions": len(transactions),
             "date_range": {
@@ -772,23 +807,22 @@ class FileParser:
                 "end": safe(df['date'].max().isoformat()) if not df.empty else None
             },
             "income_analysis": {
-                "total": safe(df[df['category'] == 'income']['amount'].sum()),
-                "average": safe(df[df['category'] == 'income']['amount'].mean()),
-                "count": len(df[df['category'] == 'income'])
+                "total": safe(income_amounts.sum()),
+                "average": safe(income_amounts.mean()),
+                "count": len(income_amounts)
             },
             "expense_analysis": {
-                "total": safe(df[df['category'] != 'income']['amount'].sum()),
-                "average": safe(df[df['category'] != 'income']['amount'].mean()),
-                "count": len(df[df['category'] != 'income'])
+                "total": safe(expense_amounts.sum()),
+                "average": safe(expense_amounts.mean()),
+                "count": len(expense_amounts)
             },
             "category_breakdown": {
-                "sum": {k: safe(v) for k, v in df.groupby('category')['amount'].sum().to_dict().items()},
-                "count": {k: safe(v) for k, v in df.groupby('category')['amount'].count().to_dict().items()},
-                "mean": {k: safe(v) for k, v in df.groupby('category')['amount'].mean().to_dict().items()},
+                stat: {k: safe(v) for k, v in category_stats[stat].to_dict().items()}
+                for stat in ("sum", "count", "mean")
             },
             "recurring_transactions": {
-                "count": int(df[df['is_recurring'] == True]['amount'].count()),
-                "total_amount": safe(df[df['is_recurring'] == True]['amount'].sum())
+                "count": int(recurring_amounts.count()),
+                "total_amount": safe(recurring_amounts.sum())
             },
             "monthly_trend": self._calculate_monthly_trend(df),
             # Explicit pattern groups
@@ -801,20 +835,22 @@ class FileParser:
     
     def _calculate_monthly_trend(self, df: pd.DataFrame) -> Dict:
         """Calculate monthly income and expense trends"""
-        df['month'] = pd.to_datetime(df['date']).dt.to_period('M')
-        
-        monthly_income = df[df['category'] == 'income'].groupby('month')['amount'].sum()
-        monthly_expense = df[df['category'] != 'income'].groupby('month')['amount'].sum()
-        
-        trend = {}
-        for month in df['month'].unique():
-            trend[str(month)] = {
-                "income": float(monthly_income.get(month, 0)),
-                "expense": float(monthly_expense.get(month, 0)),
-                "net": float(monthly_income.get(month, 0) - monthly_expense.get(month, 0))
-            }
-        
-        return trend
+        # Local series, not a df column: a Period column would leak into the pattern records
+        month = pd.to_datetime(df['date']).dt.to_period('M')
+        is_income = df['category'] == 'income'
+
+        # One grouped pass over both series; months stay in first-seen order
+        monthly = pd.DataFrame({
+            "month": month,
+            "income": df['amount'].where(is_income, 0.0),
+            "expense": df['amount'].where(~is_income, 0.0),
+        }).groupby('month', sort=False)[["income", "expense"]].sum()
+        monthly["net"] = monthly["income"] - monthly["expense"]
+
+        return {
+            str(month): {"income": float(row.income), "expense": float(row.expense), "net": float(row.net)}
+            for month, row in zip(monthly.index, monthly.itertuples(index=False))
+        }
 
     def parse_excel(self, file_content: bytes, filename: str) -> List[Transaction]:
         """Parse Excel file containing transaction data"""
@@ -830,15 +866,7 @@ class FileParser:
             if not date_cols or not amount_cols or not desc_cols:
                 raise ValueError("Could not identify required columns in Excel")
             
-            transactions = []
-            for _, row in df.iterrows():
-                transaction = self._process_transaction_row(
-                    row, date_cols[0], amount_cols[0], desc_cols[0]
-                )
-                if transaction:
-                    transactions.append(transaction)
-            
-            return transactions
+            return self._rows_to_transactions(df, date_cols[0], amount_cols[0], desc_cols[0])
             
         except Exception as e:
             raise ValueError(f"Error parsing Excel file: {str(e)}")
@@ -861,7 +889,7 @@ class FileParser:
     def parse_ais_csv(self, file_content: bytes, filename: str) -> List[Transaction]:
         """Parse AIS CSV file and normalize to Transaction model"""
         try:
-            df = pd.read_csv(BytesIO(file_content))
+            df = self._read_csv(file_content)
             # TODO: Normalize columns and extract transactions
             transactions = []
             # for _, row in df.iterrows():
@@ -1,6 +1,26 @@
+from bisect import bisect_left
+from operator import attrgetter
 from typing import Dict, List, Tuple, Optional
+import numpy as np
 from app.models.database import TaxData, TaxRegime, TaxRecommendation
 
+# Cumulative share of the year's tax due by each advance-tax deadline
+ADVANCE_TAX_SCHEDULE = (
+    ("Q1 (15 June)", 0.15),
+    ("Q2 (15 Sept)", 0.45),
+    ("Q3 (15 Dec)", 0.75),
+    ("Q4 (15 March)", 1.00),
+)
+
+# Distinct slab layouts whose precomputed tables TaxCalculator keeps
+SLAB_TABLE_CACHE_MAX_SIZE = 16
+
+# Every TaxData field the old regime lets a user claim, fetched in one C-level call
+_claimed_deductions = attrgetter(
+    "deduction_80c", "deduction_80d", "deduction_80g", "deduction_24b", "deduction_80e",
+    "deduction_80tta", "hra_exemption", "lta_exemption", "standard_deduction"
+)
+
 class TaxCalculator:
     """Indian Tax Calculator for FY 2024-25 (AY 2025-26)"""
     
@@ -33,25 +53,54 @@ class TaxCalculator:
             '80TTA': 10000,  # Savings Account Interest
             '80TTB': 50000,  # Senior Citizens Savings Interest
         }
-    
+
+        # Slab tables keyed by slab contents, so reassigned or edited slab lists never
+        # hit a stale table; the built-in regimes are precomputed
+        self._slab_tables = {}
+        for slabs in (self.old_regime_slabs, self.new_regime_slabs):
+            self._slab_table(slabs)
+
+    @staticmethod
+    def _build_slab_table(slabs: List[Tuple[float, float]]) -> Tuple[List[float], List[float], List[float], List[float]]:
+        """Slab upper limits, lower limits, rates and the cumulative tax owed below each slab"""
+        limits, lowers, rates, base_taxes = [], [], [], []
+        prev_limit, tax = 0, 0
+        for limit, rate in slabs:
+            limits.append(limit)
+            lowers.append(prev_limit)
+            rates.append(rate)
+            base_taxes.append(tax)
+            tax += (limit - prev_limit) * rate
+            prev_limit = limit
+        return limits, lowers, rates, base_taxes
+
+    def _slab_table(self, slabs: List[Tuple[float, float]]) -> Tuple[List[float], List[float], List[float], List[float]]:
+        """Cached _build_slab_table() result for these slab contents"""
+        key = tuple(slabs)
+        table = self._slab_tables.get(key)
+        if table is None:
+            if len(self._slab_tables) >= SLAB_TABLE_CACHE_MAX_SIZE:
+                del self._slab_tables[next(iter(self._slab_tables))]
+            table = self._slab_tables[key] = self._build_slab_table(slabs)
+        return table
+
     def calculate_tax(self, slabs: List[Tuple[float, float]], taxable_income: float) -> float:
         """Calculate tax based on slabs"""
         if taxable_income <= 0:
             return 0
-            
-        tax = 0
-        prev_limit = 0
-        
-        for limit, rate in slabs:
-            if taxable_income <= prev_limit:
-                break
-            
-            taxable_in_slab = min(taxable_income - prev_limit, limit - prev_limit)
-            tax += taxable_in_slab * rate
-            prev_limit = limit
-            
-        return tax
+
+        limits, lowers, rates, base_taxes = self._slab_table(slabs)
+        # Find the slab containing the income; everything below it is a fixed amount
+        i = bisect_left(limits, taxable_income)
+        if i == len(limits):
+            # Income above the last finite limit: no slab covers the excess
+            return base_taxes[-1] + (limits[-1] - lowers[-1]) * rates[-1]
+        return base_taxes[i] + (taxable_income - lowers[i]) * rates[i]
     
+    def claimed_deductions(self, tax_data: TaxData) -> float:
+        """Total old-regime deductions as entered, before section limits are applied"""
+        return sum(_claimed_deductions(tax_data))
+
     def calculate_old_regime_tax(self, tax_data: TaxData) -> Tuple[float, float]:
         """Calculate tax under old regime with all deductions"""
         # Apply all deductions
@@ -98,10 +147,58 @@ class TaxCalculator:
             
         return taxable_income, tax
     
-    def recommend_regime(self, tax_data: TaxData) -> TaxRegime:
-        """Recommend best tax regime"""
-        _, old_tax = self.calculate_old_regime_tax(tax_data)
-        _, new_tax = self.calculate_new_regime_tax(tax_data)
+    def calculate_tax_array(self, slabs: List[Tuple[float, float]], taxable_income: np.ndarray) -> np.ndarray:
+        """Vectorised calculate_tax over an array of taxable incomes"""
+        limits, lowers, rates, base_taxes = self._slab_table(slabs)
+        limits = np.asarray(limits, dtype=np.float64)
+        # Incomes past a finite top slab are taxed only up to its limit, as in calculate_tax
+        capped = np.minimum(taxable_income, limits[-1])
+        i = np.minimum(np.searchsorted(limits, capped), len(limits) - 1)
+        tax = np.asarray(base_taxes)[i] + (capped - np.asarray(lowers)[i]) * np.asarray(rates)[i]
+        return np.where(taxable_income > 0, tax, 0.0)
+
+    def calculate_regime_taxes_batch(self, tax_data_list: List[TaxData]) -> Dict[str, np.ndarray]:
+        """Both regimes for many users in one numpy pass; mirrors the per-user methods above"""
+        def column(field: str) -> np.ndarray:
+            return np.fromiter((getattr(t, field) for t in tax_data_list), dtype=np.float64, count=len(tax_data_list))
+
+        gross = column("gross_income")
+        standard = column("standard_deduction")
+        old_deductions = (
+            np.minimum(column("deduction_80c"), self.deduction_limits['80C']) +
+            np.minimum(column("deduction_80d"), self.deduction_limits['80D']) +
+            column("deduction_80g") +
+            np.minimum(column("deduction_24b"), self.deduction_limits['24B']) +
+            column("deduction_80e") +
+            np.minimum(column("deduction_80tta"), self.deduction_limits['80TTA']) +
+            column("hra_exemption") +
+            column("lta_exemption") +
+            standard
+        )
+
+        taxable_old = np.maximum(0, gross - old_deductions)
+        tax_old = self.calculate_tax_array(self.old_regime_slabs, taxable_old) * 1.04
+        tax_old = np.where(taxable_old <= 500000, np.maximum(0, tax_old - 12500), tax_old)
+
+        taxable_new = np.maximum(0, gross - standard)
+        tax_new = self.calculate_tax_array(self.new_regime_slabs, taxable_new) * 1.04
+        tax_new = np.where(taxable_new <= 700000, np.maximum(0, tax_new - 25000), tax_new)
+
+        return {
+            "taxable_income_old": taxable_old,
+            "tax_old_regime": tax_old,
+            "taxable_income_new": taxable_new,
+            "tax_new_regime": tax_new,
+        }
+
+    def recommend_regime(
+        self, tax_data: TaxData, old_tax: Optional[float] = None, new_tax: Optional[float] = None
+    ) -> TaxRegime:
+        """Recommend best tax regime (pass already-computed taxes to skip recomputing them)"""
+        if old_tax is None:
+            _, old_tax = self.calculate_old_regime_tax(tax_data)
+        if new_tax is None:
+            _, new_tax = self.calculate_new_regime_tax(tax_data)
         
         return TaxRegime.OLD if old_tax <= new_tax else TaxRegime.NEW
     
@@ -168,12 +265,7 @@ class TaxCalculator:
     
     def calculate_advance_tax(self, tax_amount: float) -> Dict[str, float]:
         """Calculate advance tax installments"""
-        return {
-            "Q1 (15 June)": tax_amount * 0.15,
-            "Q2 (15 Sept)": tax_amount * 0.45,
-            "Q3 (15 Dec)": tax_amount * 0.75,
-            "Q4 (15 March)": tax_amount * 1.00
-        }
+        return {label: tax_amount * fraction for label, fraction in ADVANCE_TAX_SCHEDULE}
     
     def estimate_tds(self, gross_income: float, tax_regime: TaxRegime) -> float:
         """Estimate TDS based on income and regime"""